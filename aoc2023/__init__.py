@@ -0,0 +1,4 @@
+"""
+    Advent of Code 2023
+    Tooling shared by the daily solutions: runner, benchmarks, helpers.
+"""
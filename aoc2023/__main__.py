@@ -0,0 +1,395 @@
+"""
+    Advent of Code 2023
+    Command line entry point: python -m aoc2023 <command> [options]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from aoc2023 import (
+    bench,
+    cache,
+    client,
+    complexity,
+    parallel,
+    profiler,
+    runner,
+    server,
+    synth,
+)
+
+DEFAULT_PARSE_CACHE = ".aoc_cache/parsed"
+
+
+def command_run(args: argparse.Namespace) -> int:
+    if args.parse_cache:
+        cache.enable(args.parse_cache)
+    days = runner.parse_days(args.days) if args.days else runner.discover_days()
+    if args.compare_serial:
+        start = time.perf_counter()
+        runner.run(days, inputs=args.inputs, backend="serial")
+        serial_wall = time.perf_counter() - start
+    start = time.perf_counter()
+    results = runner.run(
+        days,
+        args.jobs,
+        args.inputs,
+        count=args.counters,
+        backend=args.backend,
+        trace_memory=args.memory,
+        answer_cache=args.answer_cache,
+        force=args.force or args.compare_serial,
+    )
+    wall = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(runner.as_records(results), indent=2))
+    else:
+        print(runner.format_table(results))
+        total = sum(result.seconds for result in results if not result.cached)
+        print(f"\nWall time {wall:.3f}s for {total:.3f}s of solving.")
+        if cached := [result for result in results if result.cached]:
+            saved = sum(result.seconds for result in cached)
+            print(f"{len(cached)} phases from the answer cache saved {saved:.3f}s.")
+    if args.compare_serial:
+        print(
+            f"Speedup {serial_wall / wall:.2f}x on {args.jobs} {args.backend} workers "
+            f"({serial_wall:.3f}s serial, {wall:.3f}s {args.backend})",
+            file=sys.stderr if args.json else sys.stdout,
+        )
+    return 1 if any(result.error for result in results) else 0
+
+
+def command_batch(args: argparse.Namespace) -> int:
+    if args.parse_cache:
+        cache.enable(args.parse_cache)
+    paths = runner.input_paths(args.inputs)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            return write_batch(args, paths, output_file)
+    return write_batch(args, paths, sys.stdout)
+
+
+def write_batch(args: argparse.Namespace, paths: list[str], output) -> int:
+    failed = False
+    for path, results in runner.solve_many(
+        args.day, paths, args.jobs, args.backend, args.answer_cache, args.force
+    ):
+        for record in runner.as_records(results):
+            output.write(json.dumps({"input": path, **record}) + "\n")
+        output.flush()
+        failed |= any(result.error for result in results)
+    return 1 if failed else 0
+
+
+def command_bench(args: argparse.Namespace) -> int:
+    days = runner.parse_days(args.days) if args.days else runner.discover_days()
+    summary = {}
+    for day in days:
+        input_path = args.inputs.format(day=day)
+        try:
+            timings = bench.bench_day(day, input_path, args.repeat, args.warmup)
+        except FileNotFoundError:
+            print(f"Skipping day {day}: {input_path} not found", file=sys.stderr)
+            continue
+        summary.update(bench.summarize(day, timings))
+
+    report = bench.format_summary(summary)
+    if args.baseline:
+        regressions = bench.find_regressions(
+            summary, bench.load_baseline(args.baseline), args.threshold
+        )
+        if regressions:
+            report += "\n\n" + bench.format_regressions(regressions)
+    else:
+        regressions = []
+
+    if args.records:
+        report += "\n\n" + bench.format_records(bench.bench_records())
+
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(report + "\n")
+    if args.save:
+        bench.save_baseline(args.save, summary)
+    return 1 if regressions else 0
+
+
+def command_queues(args: argparse.Namespace) -> int:
+    summary = bench.summarize(17, bench.bench_queues(args.input, args.repeat))
+    print(bench.format_summary(summary))
+    return 0
+
+
+def command_profile(args: argparse.Namespace) -> int:
+    module = runner.load_day(args.day)
+    input_path = args.input or runner.DEFAULT_INPUTS.format(day=args.day)
+    interval = args.interval_ms / 1000
+    if args.part == 0:
+        name = f"day{args.day:02d}.parse"
+        func, arg = module.parse_input, input_path
+    else:
+        name = f"day{args.day:02d}.part{args.part}"
+        func = runner.part_function(module, args.day, args.part)
+        arg = module.parse_input(input_path)
+    run = profiler.profile(func, arg, interval=interval, name=name)
+    print(profiler.format_top(run, args.top))
+    if args.collapsed:
+        with open(args.collapsed, "w", encoding="utf-8") as output_file:
+            output_file.write(run.collapsed())
+    if args.speedscope:
+        with open(args.speedscope, "w", encoding="utf-8") as output_file:
+            json.dump(run.speedscope(), output_file)
+    return 0
+
+
+def command_calibration(args: argparse.Namespace) -> int:
+    throughput = bench.bench_calibration(args.input, args.repeat)
+    for name, rate in throughput.items():
+        print(f"{name:<10} {rate:>10.1f} MB/s")
+    return 0
+
+
+def command_startup(args: argparse.Namespace) -> int:
+    days = runner.parse_days(args.days) if args.days else runner.discover_days()
+    limit = args.limit_ms / 1000
+    times = {
+        f"aoc2023_day{day:02d}": bench.import_time(f"aoc2023_day{day:02d}", args.runs)
+        for day in days
+    }
+    print(bench.format_import_times(times, limit))
+    return 1 if any(own > limit for _, own in times.values()) else 0
+
+
+def command_complexity(args: argparse.Namespace) -> int:
+    days = runner.parse_days(args.days) if args.days else sorted(complexity.BOUNDS)
+    over = False
+    for day in days:
+        checks = complexity.check(day)
+        print(complexity.format_check(day, checks), flush=True)
+        over |= any(exponent > bound for _, exponent, bound in checks)
+    return 1 if over else 0
+
+
+def command_gen(args: argparse.Namespace) -> int:
+    text = synth.generate(args.day, args.scale, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="ascii") as output_file:
+            output_file.write(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+def command_serve(args: argparse.Namespace) -> int:
+    if args.parse_cache:
+        cache.enable(args.parse_cache)
+    print(f"Serving on {args.socket}", file=sys.stderr)
+    server.serve(args.socket, args.max_inputs)
+    return 0
+
+
+def command_solve(args: argparse.Namespace) -> int:
+    with client.Client(args.socket) as solver:
+        if args.stop:
+            solver.request({"op": "shutdown"})
+            return 0
+        reply = solver.solve(args.day, args.part, args.input)
+    if args.json:
+        print(json.dumps(reply))
+    elif "error" in reply:
+        print(reply["error"], file=sys.stderr)
+    else:
+        print(reply["answer"])
+    return 1 if "error" in reply else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m aoc2023")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="solve several days on a process pool")
+    run.add_argument("--days", help='days to run, e.g. "1-20" or "1,3,5-7"')
+    run.add_argument("--jobs", type=int, default=runner.default_jobs())
+    run.add_argument(
+        "--inputs",
+        default=runner.DEFAULT_INPUTS,
+        help="input path template (default: %(default)s)",
+    )
+    run.add_argument(
+        "--backend",
+        choices=parallel.available_backends(),
+        default=parallel.default_backend(),
+        help="where days, or the work items of a single day, run "
+        "(default: %(default)s)",
+    )
+    run.add_argument(
+        "--compare-serial",
+        action="store_true",
+        help="also run serially and report the speedup",
+    )
+    run.add_argument("--json", action="store_true", help="print results as JSON")
+    run.add_argument(
+        "--counters", action="store_true", help="report solver operation counts"
+    )
+    run.add_argument(
+        "--force", action="store_true", help="solve again, ignoring cached answers"
+    )
+    run.add_argument(
+        "--answer-cache",
+        default=runner.DEFAULT_ANSWER_CACHE,
+        metavar="DIR",
+        help="where answers are cached (default: %(default)s)",
+    )
+    run.add_argument(
+        "--memory",
+        action="store_true",
+        help="report the peak allocation of every phase (slower)",
+    )
+    run.add_argument(
+        "--parse-cache",
+        nargs="?",
+        const=DEFAULT_PARSE_CACHE,
+        metavar="DIR",
+        help="reuse parsed inputs stored in DIR (default: %(const)s)",
+    )
+    run.set_defaults(func=command_run)
+
+    batch = commands.add_parser(
+        "batch", help="solve one day for many inputs, as JSON lines"
+    )
+    batch.add_argument("day", type=int)
+    batch.add_argument("inputs", nargs="+", help="input files, or directories of them")
+    batch.add_argument("--jobs", type=int, default=runner.default_jobs())
+    batch.add_argument(
+        "--backend",
+        choices=parallel.available_backends(),
+        default="serial",
+        help="where the inputs are solved (default: %(default)s)",
+    )
+    batch.add_argument("-o", "--output", help="JSON lines file (default: stdout)")
+    batch.add_argument("--force", action="store_true")
+    batch.add_argument(
+        "--answer-cache", default=runner.DEFAULT_ANSWER_CACHE, metavar="DIR"
+    )
+    batch.add_argument(
+        "--parse-cache", nargs="?", const=DEFAULT_PARSE_CACHE, metavar="DIR"
+    )
+    batch.set_defaults(func=command_batch)
+
+    bench_cmd = commands.add_parser("bench", help="time every phase of every day")
+    bench_cmd.add_argument("--days", help='days to run, e.g. "1-20" or "1,3,5-7"')
+    bench_cmd.add_argument("--inputs", default=runner.DEFAULT_INPUTS)
+    bench_cmd.add_argument("--repeat", type=int, default=5)
+    bench_cmd.add_argument("--warmup", type=int, default=1)
+    bench_cmd.add_argument("--save", metavar="JSON", help="write a new baseline")
+    bench_cmd.add_argument("--baseline", metavar="JSON", help="compare to a baseline")
+    bench_cmd.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed slowdown of the median vs the baseline (default: %(default)s)",
+    )
+    bench_cmd.add_argument("--output", help="also write the report to this file")
+    bench_cmd.add_argument(
+        "--records",
+        action="store_true",
+        help="add bytes and creations per second of the record types",
+    )
+    bench_cmd.set_defaults(func=command_bench)
+
+    queues = commands.add_parser(
+        "queues", help="compare the shortest path queues on day 17"
+    )
+    queues.add_argument(
+        "input", nargs="?", default=runner.DEFAULT_INPUTS.format(day=17)
+    )
+    queues.add_argument("--repeat", type=int, default=5)
+    queues.set_defaults(func=command_queues)
+
+    profile = commands.add_parser(
+        "profile", help="sample the stack of one day and part, export flame graphs"
+    )
+    profile.add_argument("day", type=int)
+    profile.add_argument("part", type=int, choices=(0, 1, 2), help="0 for the parse")
+    profile.add_argument("--input", help="input file (default: the day's input)")
+    profile.add_argument(
+        "--interval-ms",
+        type=float,
+        default=1.0,
+        help="time between samples (default: %(default)s)",
+    )
+    profile.add_argument("--top", type=int, default=10, help="functions to list")
+    profile.add_argument("--collapsed", metavar="FILE", help="write collapsed stacks")
+    profile.add_argument("--speedscope", metavar="FILE", help="write a speedscope file")
+    profile.set_defaults(func=command_profile)
+
+    calibration = commands.add_parser(
+        "calibration", help="throughput of day 1 part 1, scanned and vectorized"
+    )
+    calibration.add_argument(
+        "input", nargs="?", default=runner.DEFAULT_INPUTS.format(day=1)
+    )
+    calibration.add_argument("--repeat", type=int, default=5)
+    calibration.set_defaults(func=command_calibration)
+
+    startup = commands.add_parser("startup", help="check the import time of each day")
+    startup.add_argument("--days", help='days to check, e.g. "1-20" or "1,3,5-7"')
+    startup.add_argument("--runs", type=int, default=5, help="keep the best of N runs")
+    startup.add_argument(
+        "--limit-ms", type=float, default=3.0, help="budget for the non stdlib imports"
+    )
+    startup.set_defaults(func=command_startup)
+
+    complexity_cmd = commands.add_parser(
+        "complexity", help="fit how the time of each part grows with its input"
+    )
+    complexity_cmd.add_argument("--days", help='days to check, e.g. "1-19"')
+    complexity_cmd.set_defaults(func=command_complexity)
+
+    serve = commands.add_parser("serve", help="keep the days warm behind a socket")
+    serve.add_argument("--socket", default=client.DEFAULT_SOCKET)
+    serve.add_argument(
+        "--max-inputs",
+        type=int,
+        default=server.DEFAULT_MAX_INPUTS,
+        help="parsed inputs kept in memory (default: %(default)s)",
+    )
+    serve.add_argument(
+        "--parse-cache", nargs="?", const=DEFAULT_PARSE_CACHE, metavar="DIR"
+    )
+    serve.set_defaults(func=command_serve)
+
+    solve = commands.add_parser("solve", help="ask a running server for an answer")
+    solve.add_argument("day", type=int, nargs="?")
+    solve.add_argument("part", type=int, nargs="?", choices=(1, 2))
+    solve.add_argument("input", nargs="?")
+    solve.add_argument("--socket", default=client.DEFAULT_SOCKET)
+    solve.add_argument("--json", action="store_true", help="print the whole reply")
+    solve.add_argument("--stop", action="store_true", help="shut the server down")
+    solve.set_defaults(func=command_solve)
+
+    gen = commands.add_parser("gen", help="generate a synthetic puzzle input")
+    gen.add_argument("day", type=int, choices=sorted(synth.GENERATORS))
+    gen.add_argument("--scale", type=float, default=1, help="size vs a real input")
+    gen.add_argument("--seed", type=int, default=0)
+    gen.add_argument("-o", "--output", help="output file (default: stdout)")
+    gen.set_defaults(func=command_gen)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    solve = args.command == "solve"
+    if solve and not args.stop and None in (args.day, args.part, args.input):
+        parser.error("solve needs a day, a part and an input, unless --stop")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""
+    Advent of Code 2023
+    Benchmarks: time parse_input and both parts of every day, compare to a baseline.
+"""
+
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import ModuleType
+
+from aoc2023 import memory, runner
+
+PHASES = ("parse", "part1", "part2")
+
+# Record types the solvers create by the thousand: (day, class name, typical
+# arguments). The slotted classes are compared to the same ones with a dict.
+RECORDS = {
+    "day15.Lens": (15, "Lens", ("rn", 1)),
+    "day19.Part": (19, "Part", (787, 2655, 1222, 2876)),
+    "day19.Rule": (19, "Rule", (("a", "<", 2006), "qkq")),
+    "day20.Pulse": (20, "Pulse", ("broadcaster", "a", "low")),
+}
+
+Timings = dict[str, list[float]]
+Summary = dict[str, dict[str, float]]
+
+
+def clear_caches(module: ModuleType) -> None:
+    # Memoized helpers (e.g. count_possible in day 12) would turn every
+    # repetition after the first into a cache lookup.
+    for value in vars(module).values():
+        if callable(getattr(value, "cache_clear", None)):
+            value.cache_clear()
+
+
+def time_call(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def bench_day(day: int, input_path: str, repeat: int = 5, warmup: int = 1) -> Timings:
+    module = runner.load_day(day)
+    data = module.parse_input(input_path)
+    phases = {
+        "parse": (module.parse_input, input_path),
+        "part1": (runner.part_function(module, day, 1), data),
+        "part2": (runner.part_function(module, day, 2), data),
+    }
+
+    timings = {}
+    for phase, (func, arg) in phases.items():
+        for _ in range(warmup):
+            clear_caches(module)
+            func(arg)
+        samples = []
+        for _ in range(repeat):
+            clear_caches(module)
+            samples.append(time_call(func, arg))
+        timings[phase] = samples
+    return timings
+
+
+def bench_queues(input_path: str, repeat: int = 5) -> Timings:
+    """Time both parts of day 17 with each queue of aoc2023.search."""
+    module = runner.load_day(17)
+    grid, destination = module.parse_input(input_path)
+    timings = {}
+    for queue in module.QUEUES:
+        for part, (min_moves, max_moves) in ((1, (1, 3)), (2, (4, 10))):
+            timings[f"{queue}.part{part}"] = [
+                time_call(module.solve, grid, destination, min_moves, max_moves, queue)
+                for _ in range(repeat)
+            ]
+    return timings
+
+
+def bench_calibration(input_path: str, repeat: int = 5) -> dict[str, float]:
+    """Throughput in MB/s of day 1 part 1, scanned by the automaton and
+    vectorized with NumPy, best of repeat runs over the same buffer."""
+    module = runner.load_day(1)
+    data = Path(input_path).read_bytes()
+    digits = module.automaton(words=False)
+    module.calibrate_digits(b"")  # import NumPy outside the timings
+    methods = {
+        "automaton": lambda: module.calibrate(data, digits),
+        "numpy": lambda: module.calibrate_digits(data),
+    }
+    return {
+        name: len(data) / 1e6 / min(time_call(method) for _ in range(repeat))
+        for name, method in methods.items()
+    }
+
+
+def with_dict(cls: type) -> type:
+    """The same record as cls, storing its fields in a __dict__."""
+    return type(cls.__name__, (), {"__init__": cls.__init__})
+
+
+def record_footprint(
+    cls: type, args: tuple, count: int = 100_000
+) -> tuple[float, float]:
+    """(bytes per instance, instances created per second) of cls(*args)."""
+
+    def create():
+        return [cls(*args) for _ in range(count)]
+
+    records, peak = memory.measure(create)
+    per_object = (peak - sys.getsizeof(records)) / count
+    del records
+    return per_object, count / min(time_call(create) for _ in range(3))
+
+
+def bench_records(count: int = 100_000) -> dict[str, tuple[float, ...]]:
+    """(bytes, objects/s) of each record of RECORDS, slotted then with a dict."""
+    footprints = {}
+    for name, (day, class_name, args) in RECORDS.items():
+        cls = getattr(runner.load_day(day), class_name)
+        footprints[name] = record_footprint(cls, args, count) + record_footprint(
+            with_dict(cls), args, count
+        )
+    return footprints
+
+
+def format_records(footprints: dict[str, tuple[float, ...]]) -> str:
+    header = (
+        f"{'Record':<14} {'slots (B)':>10} {'dict (B)':>10}"
+        f" {'slots (obj/s)':>14} {'dict (obj/s)':>14}"
+    )
+    lines = [header]
+    lines.extend(
+        f"{name:<14} {slots_bytes:>10.0f} {dict_bytes:>10.0f}"
+        f" {slots_rate:>14,.0f} {dict_rate:>14,.0f}"
+        for name, (slots_bytes, slots_rate, dict_bytes, dict_rate) in footprints.items()
+    )
+    return "\n".join(lines)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    # Nearest-rank percentile, good enough for a handful of samples.
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(day: int, timings: Timings) -> Summary:
+    return {
+        f"day{day:02d}.{phase}": {
+            "median": statistics.median(samples),
+            "p95": percentile(samples, 95),
+        }
+        for phase, samples in timings.items()
+    }
+
+
+def find_regressions(
+    current: Summary, baseline: Summary, threshold: float
+) -> list[tuple[str, float, float]]:
+    return [
+        (key, baseline[key]["median"], stats["median"])
+        for key, stats in current.items()
+        if key in baseline
+        and stats["median"] > baseline[key]["median"] * (1 + threshold)
+    ]
+
+
+def load_baseline(path: str) -> Summary:
+    return json.loads(Path(path).read_text(encoding="utf-8"))["phases"]
+
+
+def save_baseline(path: str, summary: Summary) -> None:
+    content = {"version": 1, "phases": summary}
+    Path(path).write_text(json.dumps(content, indent=2) + "\n", encoding="utf-8")
+
+
+def format_summary(summary: Summary) -> str:
+    lines = [f"{'Phase':<18} {'Median (ms)':>12} {'p95 (ms)':>12}"]
+    lines.extend(
+        f"{key:<18} {stats['median'] * 1000:>12.3f} {stats['p95'] * 1000:>12.3f}"
+        for key, stats in summary.items()
+    )
+    return "\n".join(lines)
+
+
+def format_regressions(regressions: list[tuple[str, float, float]]) -> str:
+    return "\n".join(
+        f"REGRESSION {key}: {before * 1000:.3f} ms -> {after * 1000:.3f} ms "
+        f"({after / before - 1:+.0%})"
+        for key, before, after in regressions
+    )
+
+
+def import_time(module_name: str, runs: int = 5) -> tuple[float, float]:
+    """Best import time of a module in a fresh interpreter, in seconds, as
+    (total, own): own leaves out the standard library modules it pulls in,
+    whose cost any script pays anyway, and counts everything else.
+
+    An untimed import first compiles the modules into a temporary bytecode
+    cache, so that the runs time what every import but the first one costs,
+    even where PYTHONDONTWRITEBYTECODE is set or the tree is read-only."""
+    best_total = best_own = math.inf
+    with tempfile.TemporaryDirectory() as pycache_prefix:
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=pycache_prefix)
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        command = [sys.executable, "-c", f"import {module_name}"]
+        subprocess.run(command, check=True, cwd=runner.ROOT, env=env)
+        for _ in range(runs):
+            process = subprocess.run(
+                [*command[:1], "-X", "importtime", *command[1:]],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=runner.ROOT,
+                env=env,
+            )
+            total = own = 0
+            # Lines look like: "import time: self [us] | cumulative | imported
+            # package", the imports done by the interpreter itself come first
+            # and end with site.
+            lines = process.stderr.splitlines()
+            site = max(i for i, line in enumerate(lines) if line.endswith("| site"))
+            for line in lines[site + 1 :]:
+                self_us, cumulative_us, package = line.split("|")
+                package = package.strip()
+                if package == module_name:
+                    total = int(cumulative_us)
+                if package.split(".")[0] not in sys.stdlib_module_names:
+                    own += int(self_us.split(":")[1])
+            best_total = min(best_total, total / 1e6)
+            best_own = min(best_own, own / 1e6)
+    return best_total, best_own
+
+
+def modules_loaded_by(module_names: list[str]) -> set[str]:
+    code = "import sys; " + "".join(f"import {name}; " for name in module_names)
+    code += "print(' '.join(sys.modules))"
+    process = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=runner.ROOT,
+    )
+    return set(process.stdout.split())
+
+
+def format_import_times(times: dict[str, tuple[float, float]], limit: float) -> str:
+    lines = [f"{'module':<14} {'total':>11} {'own':>11}"]
+    for name, (total, own) in times.items():
+        lines.append(
+            f"{name:<14} {total * 1000:>8.2f} ms {own * 1000:>8.2f} ms"
+            + ("  OVER LIMIT" if own > limit else "")
+        )
+    return "\n".join(lines)
+
+
+def test_percentile():
+    samples = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert percentile(samples, 50) == 3.0
+    assert percentile(samples, 95) == 5.0
+    assert percentile([7.0], 95) == 7.0
+
+
+def test_find_regressions():
+    baseline = {"day01.part1": {"median": 1.0, "p95": 1.0}}
+    slower = {"day01.part1": {"median": 1.3, "p95": 1.5}}
+    assert find_regressions(slower, baseline, threshold=0.5) == []
+    assert find_regressions(slower, baseline, threshold=0.2) == [
+        ("day01.part1", 1.0, 1.3)
+    ]
+    assert find_regressions({"day02.parse": {"median": 9.0}}, baseline, 0.2) == []
+
+
+def test_bench_day(tmp_path):
+    summary = summarize(2, bench_day(2, "data/day02_test.txt", repeat=3, warmup=0))
+    assert list(summary) == ["day02.parse", "day02.part1", "day02.part2"]
+    save_baseline(tmp_path / "baseline.json", summary)
+    assert load_baseline(tmp_path / "baseline.json") == summary
+
+
+def test_bench_queues():
+    summary = summarize(17, bench_queues("data/day17_test.txt", repeat=1))
+    assert len(summary) == 6 and "day17.astar.part2" in summary
+
+
+def test_bench_calibration():
+    throughput = bench_calibration("data/day01_test1.txt", repeat=1)
+    assert set(throughput) == {"automaton", "numpy"}
+    assert all(rate > 0 for rate in throughput.values())
+
+
+def test_bench_records():
+    footprints = bench_records(count=1000)
+    assert list(footprints) == list(RECORDS)
+    for slots_bytes, _, dict_bytes, _ in footprints.values():
+        assert 0 < slots_bytes < dict_bytes
+    assert "day19.Part" in format_records(footprints)
+
+
+def test_solutions_do_not_import_heavy_modules():
+    modules = [f"aoc2023_day{day:02d}" for day in runner.discover_days()]
+    loaded = modules_loaded_by(modules)
+    assert not loaded & {"pytest", "numpy"}
+
+
+def test_import_time():
+    # Generous bound, the startup command checks the real budget.
+    total, own = import_time("aoc2023_day17", runs=1)
+    assert 0 < own <= total < 0.5
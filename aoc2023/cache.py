@@ -0,0 +1,237 @@
+"""
+    Advent of Code 2023
+    Caches: parsed inputs and answers kept on disk, keyed by content.
+
+    The parse cache is opt-in: set AOC2023_PARSE_CACHE to a directory (or pass
+    --parse-cache to the runner). The answer cache is used by the runner unless
+    --force is given. Entries are keyed by a hash of the input file, of the
+    source of the solution module and of the repository modules it imports, and
+    of the Python version, so editing the input or any of that code invalidates
+    them.
+
+    A parse returning a lazy reader (reader.Lines or reader.Blocks) is not
+    stored: the reader is only a path, read again on every pass.
+"""
+
+import functools
+import os
+import sys
+
+# ast, hashlib, json, pickle and pathlib are imported when a cache is used:
+# every solution module imports this one, and must stay quick to import.
+
+CACHE_ENV = "AOC2023_PARSE_CACHE"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def read_bytes(file_name) -> bytes:
+    with open(file_name, "rb") as data_file:
+        return data_file.read()
+
+
+def local_module_file(module_name: str) -> str | None:
+    """The source file of a module of this repository, None for any other."""
+    if not module_name.startswith("aoc2023"):
+        return None
+    if module := sys.modules.get(module_name):
+        return getattr(module, "__file__", None)
+    base = os.path.join(ROOT, *module_name.split("."))
+    for file_name in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(file_name):
+            return file_name
+    return None
+
+
+def imported_names(source: bytes) -> set[str]:
+    """Names of the modules (or module attributes) imported by source."""
+    import ast  # pylint: disable=import-outside-toplevel
+
+    names = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+    return names
+
+
+def source_digest(module_name: str) -> bytes:
+    """Hash of the source of a module and of every repository module it
+    imports, transitively."""
+    import hashlib  # pylint: disable=import-outside-toplevel
+
+    # A solution run as a script is __main__, not an aoc2023 module.
+    file_name = local_module_file(module_name) or sys.modules[module_name].__file__
+    sources = {}
+    pending = [(module_name, file_name)]
+    while pending:
+        name, file_name = pending.pop()
+        if name in sources or file_name is None:
+            continue
+        sources[name] = read_bytes(file_name)
+        pending.extend(
+            (imported, local_module_file(imported))
+            for imported in imported_names(sources[name])
+        )
+
+    digest = hashlib.blake2b()
+    for name in sorted(sources):
+        digest.update(f"{name}:{len(sources[name])}:".encode())
+        digest.update(sources[name])
+    return digest.digest()
+
+
+def cache_key(parse_input, file_name: str) -> str:
+    import hashlib  # pylint: disable=import-outside-toplevel
+
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{sys.version_info[:2]}:{parse_input.__module__}:".encode())
+    digest.update(parse_input.__qualname__.encode())
+    digest.update(source_digest(parse_input.__module__))
+    digest.update(read_bytes(file_name))
+    return digest.hexdigest()
+
+
+def load_or_parse(parse_input, file_name: str, cache_dir):
+    import pickle  # pylint: disable=import-outside-toplevel
+    from pathlib import Path  # pylint: disable=import-outside-toplevel
+
+    from aoc2023.reader import Blocks, Lines  # pylint: disable=import-outside-toplevel
+
+    entry = Path(cache_dir) / f"{cache_key(parse_input, file_name)}.pickle"
+    try:
+        with open(entry, "rb") as cache_file:
+            return pickle.load(cache_file)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        pass
+
+    data = parse_input(file_name)
+    # Lines and Blocks hold a path and read it again on every pass: stored
+    # under a key of the contents, they would stand for any file of the same
+    # contents, whatever it holds by then, so they are never stored.
+    if not isinstance(data, (Lines, Blocks)):
+        write_entry(entry, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+    return data
+
+
+def write_entry(entry, content: bytes) -> None:
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    # Write aside then rename, so that concurrent runs never read half an entry.
+    partial = entry.with_suffix(f".{os.getpid()}.tmp")
+    with open(partial, "wb") as cache_file:
+        cache_file.write(content)
+    os.replace(partial, entry)
+
+
+def cached_parse(parse_input):
+    """Decorator for parse_input functions, a no-op unless the cache is enabled."""
+
+    @functools.wraps(parse_input)
+    def wrapper(file_name):
+        if cache_dir := os.environ.get(CACHE_ENV):
+            return load_or_parse(parse_input, file_name, cache_dir)
+        return parse_input(file_name)
+
+    return wrapper
+
+
+def enable(cache_dir) -> None:
+    os.environ[CACHE_ENV] = str(cache_dir)
+
+
+def answer_key(module_name: str, file_name: str) -> str:
+    import hashlib  # pylint: disable=import-outside-toplevel
+
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{sys.version_info[:2]}:{module_name}:".encode())
+    digest.update(source_digest(module_name))
+    digest.update(read_bytes(file_name))
+    return digest.hexdigest()
+
+
+def load_answers(cache_dir, key: str) -> list | None:
+    """The (part, answer, seconds) entries stored under key, if any."""
+    import json  # pylint: disable=import-outside-toplevel
+    from pathlib import Path  # pylint: disable=import-outside-toplevel
+
+    try:
+        with open(Path(cache_dir) / f"{key}.json", "rb") as cache_file:
+            return json.load(cache_file)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def save_answers(cache_dir, key: str, entries: list) -> None:
+    import json  # pylint: disable=import-outside-toplevel
+    from pathlib import Path  # pylint: disable=import-outside-toplevel
+
+    try:
+        content = json.dumps(entries).encode()
+    except TypeError:
+        return  # an answer JSON cannot hold, solve it again next time
+    write_entry(Path(cache_dir) / f"{key}.json", content)
+
+
+def test_cached_parse(tmp_path, monkeypatch):
+    calls = []
+
+    @cached_parse
+    def parse_input(file_name):
+        calls.append(file_name)
+        with open(file_name, "r", encoding="ascii") as data_file:
+            return data_file.read().splitlines()
+
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("a\nb\n", encoding="ascii")
+
+    monkeypatch.delenv(CACHE_ENV, raising=False)
+    assert parse_input(input_file) == ["a", "b"]
+    assert len(calls) == 1
+
+    monkeypatch.setenv(CACHE_ENV, str(tmp_path / "cache"))
+    assert parse_input(input_file) == ["a", "b"]
+    assert parse_input(input_file) == ["a", "b"]
+    assert len(calls) == 2
+
+    input_file.write_text("c\n", encoding="ascii")
+    assert parse_input(input_file) == ["c"]
+    assert len(calls) == 3
+
+
+def test_cached_parse_lazy_reader(tmp_path, monkeypatch):
+    from aoc2023.reader import Lines  # pylint: disable=import-outside-toplevel
+
+    @cached_parse
+    def parse_input(file_name):
+        return Lines(file_name)
+
+    first, second = tmp_path / "a.txt", tmp_path / "b.txt"
+    first.write_bytes(b"1\n2\n")
+    second.write_bytes(b"1\n2\n")
+    monkeypatch.setenv(CACHE_ENV, str(tmp_path / "cache"))
+    assert list(parse_input(first)) == [b"1", b"2"]
+    first.write_bytes(b"3\n")
+    assert list(parse_input(second)) == [b"1", b"2"]
+    first.unlink()
+    assert list(parse_input(second)) == [b"1", b"2"]
+    assert not (tmp_path / "cache").exists()
+
+
+def test_source_digest():
+    assert {"aoc2023.cache", "aoc2023.grid.Grid"} <= imported_names(
+        read_bytes(local_module_file("aoc2023_day16"))
+    )
+    assert local_module_file("aoc2023.grid").endswith("grid.py")
+    assert local_module_file("aoc2023.grid.Grid") is None
+    assert local_module_file("itertools") is None
+    # Day 16 imports the grid, day 6 none of the shared modules but the cache.
+    assert source_digest("aoc2023_day16") != source_digest("aoc2023_day06")
+
+
+def test_answers(tmp_path):
+    key = answer_key("aoc2023_day02", "data/day02_test.txt")
+    assert load_answers(tmp_path, key) is None
+    save_answers(tmp_path, key, [[0, None, 0.5], [1, 8, 0.25]])
+    assert load_answers(tmp_path, key) == [[0, None, 0.5], [1, 8, 0.25]]
+    assert key != answer_key("aoc2023_day02", "data/day04_test.txt")
@@ -0,0 +1,60 @@
+"""
+    Advent of Code 2023
+    Solver client: ask a running solver daemon (see server.py) for an answer.
+
+    Kept apart from the server and the rest of the tooling so that a one-shot
+    "python -m aoc2023.client DAY PART INPUT" only imports json and socket.
+"""
+
+import json
+import os
+import socket
+import sys
+
+DEFAULT_SOCKET = ".aoc_cache/solver.sock"
+
+
+class Client:
+    def __init__(self, socket_path: str = DEFAULT_SOCKET):
+        self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.connection.connect(socket_path)
+        self.stream = self.connection.makefile("rwb")
+
+    def request(self, request: dict) -> dict:
+        self.stream.write(json.dumps(request).encode() + b"\n")
+        self.stream.flush()
+        return json.loads(self.stream.readline())
+
+    def solve(self, day: int, part: int, input_path: str) -> dict:
+        return self.request(
+            {"day": day, "part": part, "input": os.path.abspath(input_path)}
+        )
+
+    def close(self) -> None:
+        self.stream.close()
+        self.connection.close()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Usage: python -m aoc2023.client DAY PART INPUT [SOCKET]"""
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) not in (3, 4):
+        print(main.__doc__, file=sys.stderr)
+        return 2
+    with Client(*args[3:]) as client:
+        reply = client.solve(int(args[0]), int(args[1]), args[2])
+    if "error" in reply:
+        print(reply["error"], file=sys.stderr)
+        return 1
+    print(reply["answer"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
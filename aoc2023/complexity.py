@@ -0,0 +1,165 @@
+"""
+    Advent of Code 2023
+    Complexity: fit how the time of each part grows with the size of its input.
+
+    Every part is timed on synthetic inputs of geometrically increasing size and
+    the exponent k of time ~ size ** k is fitted by least squares on a log-log
+    scale, size being the length of the input in bytes. BOUNDS declares the
+    largest exponent allowed for each day and part, so that an accidental
+    quadratic loop fails a test rather than only making a benchmark slower.
+
+    The check takes a few minutes, so its test only runs when AOC2023_COMPLEXITY
+    is set; "python -m aoc2023 complexity" runs it for any days.
+"""
+
+import math
+import os
+import tempfile
+import time
+
+from aoc2023 import bench, runner, synth
+
+COMPLEXITY_ENV = "AOC2023_COMPLEXITY"
+GROWTH = 2  # size ratio between two measurements
+STEPS = 4
+# Scale ratio between two measurements where the size is not proportional to
+# the scale: the rings of day 8 grow as its square root.
+SCALE_GROWTHS = {8: GROWTH**2}
+# The time of some days depends on the shape of the input as much as on its
+# size (how far a beam goes, how long a loop is), every size adds up 3 inputs.
+SEEDS = (0, 1, 2)
+
+# Smallest scale of the synthetic inputs, chosen so that the largest one solves
+# in about a second. Day 6 has a fixed size, day 20 no solution yet.
+BASE_SCALES = {
+    1: 2,
+    2: 2,
+    3: 4,
+    4: 2,
+    5: 16,
+    7: 1,
+    8: 1,
+    9: 1,
+    10: 1,
+    11: 2,
+    12: 0.05,
+    13: 1,
+    14: 0.1,
+    15: 2,
+    16: 0.05,
+    17: 0.05,
+    18: 2,
+    19: 4,
+}
+
+# Largest exponent allowed for (part 1, part 2). Linear and n log n solvers
+# fit between 0.9 and 1.3 and get a bound of 1.4, quadratic ones 2.5.
+BOUNDS = {
+    1: (1.4, 1.4),
+    2: (1.4, 1.4),
+    3: (1.4, 1.4),
+    4: (1.4, 1.4),
+    # Part 1 bisects every seed into every map, n log n plus some noise.
+    5: (1.5, 1.4),
+    7: (1.4, 1.4),
+    8: (1.4, 1.4),
+    9: (1.4, 1.4),
+    # The walk along the loop is linear, but hops all over a dict of pipes
+    # that outgrows the CPU caches.
+    10: (1.6, 1.4),
+    11: (1.4, 1.4),
+    # Records get longer with the input, and count_possible is polynomial in
+    # their length (with a higher degree once unfolded).
+    12: (1.8, 2.5),
+    13: (1.4, 1.4),
+    # More cycles are needed before a bigger platform repeats.
+    14: (1.4, 2.0),
+    15: (1.4, 1.4),
+    16: (1.4, 1.4),
+    17: (1.4, 1.4),
+    18: (1.4, 1.4),
+    19: (1.4, 1.4),
+}
+
+
+def time_part(func, data, module, budget: float = 0.05) -> float:
+    """Best time of func(data), repeated for about budget seconds."""
+    best = math.inf
+    deadline = time.perf_counter() + budget
+    while True:
+        bench.clear_caches(module)
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+        if time.perf_counter() > deadline:
+            return best
+
+
+def fit_exponent(points: list[tuple[float, float]]) -> float:
+    """Slope of the least squares line through the (log size, log time) points."""
+    xs = [math.log(size) for size, _ in points]
+    ys = [math.log(seconds) for _, seconds in points]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    return covariance / sum((x - mean_x) ** 2 for x in xs)
+
+
+def measure(day: int) -> dict[int, list[tuple[float, float]]]:
+    """(input size, seconds) of both parts of day, for every size, both
+    summed over the inputs generated from SEEDS."""
+    module = runner.load_day(day)
+    points = {1: [], 2: []}
+    with tempfile.TemporaryDirectory() as directory:
+        for step in range(STEPS):
+            scale = BASE_SCALES[day] * SCALE_GROWTHS.get(day, GROWTH) ** step
+            size, seconds = 0, {1: 0.0, 2: 0.0}
+            for seed in SEEDS:
+                path = synth.write_input(
+                    day, os.path.join(directory, f"{seed}.txt"), scale, seed
+                )
+                size += path.stat().st_size
+                data = module.parse_input(str(path))
+                for part in (1, 2):
+                    func = runner.part_function(module, day, part)
+                    seconds[part] += time_part(func, data, module)
+            for part in (1, 2):
+                points[part].append((size, seconds[part]))
+    return points
+
+
+def check(day: int) -> list[tuple[int, float, float]]:
+    """(part, fitted exponent, bound) for both parts of day."""
+    points = measure(day)
+    return [
+        (part, fit_exponent(points[part]), BOUNDS[day][part - 1]) for part in (1, 2)
+    ]
+
+
+def format_check(day: int, checks: list[tuple[int, float, float]]) -> str:
+    return "\n".join(
+        f"day{day:02d}.part{part}  n^{exponent:.2f}  (bound n^{bound:.1f})"
+        + ("  OVER BOUND" if exponent > bound else "")
+        for part, exponent, bound in checks
+    )
+
+
+def test_fit_exponent():
+    sizes = [100, 200, 400, 800]
+    assert math.isclose(fit_exponent([(n, 3e-6 * n) for n in sizes]), 1)
+    assert math.isclose(fit_exponent([(n, 1e-9 * n * n) for n in sizes]), 2)
+    n_log_n = fit_exponent([(n, n * math.log(n)) for n in sizes])
+    assert 1 < n_log_n < BOUNDS[1][0]
+
+
+def test_complexity_bounds():
+    if not os.environ.get(COMPLEXITY_ENV):
+        import unittest  # pylint: disable=import-outside-toplevel
+
+        raise unittest.SkipTest(f"set {COMPLEXITY_ENV}=1 to check the bounds")
+    failures = [
+        format_check(day, [(part, exponent, bound)])
+        for day in BOUNDS
+        for part, exponent, bound in check(day)
+        if exponent > bound
+    ]
+    assert not failures, "\n".join(failures)
@@ -0,0 +1,45 @@
+"""
+    Advent of Code 2023
+    Counters: operation counts reported by the solvers, off unless enabled.
+
+    Solvers count in local variables inside their hot loops and report the
+    totals once, so the cost when disabled is a function call per solve.
+"""
+
+enabled = False
+counts: dict[str, int] = {}
+
+
+def enable(on: bool = True) -> None:
+    global enabled  # pylint: disable=global-statement
+    enabled = on
+
+
+def add(name: str, value: int = 1) -> None:
+    if enabled:
+        counts[name] = counts.get(name, 0) + value
+
+
+def reset() -> None:
+    counts.clear()
+
+
+def snapshot() -> dict[str, int]:
+    return dict(sorted(counts.items()))
+
+
+def test_counters():
+    reset()
+    enable(False)
+    add("day00.steps", 3)
+    assert snapshot() == {}
+
+    enable()
+    try:
+        add("day00.steps", 3)
+        add("day00.steps")
+        add("day00.cache_hits", 2)
+        assert snapshot() == {"day00.cache_hits": 2, "day00.steps": 4}
+    finally:
+        enable(False)
+        reset()
@@ -0,0 +1,117 @@
+"""
+    Advent of Code 2023
+    Cycles: find when an iterated function repeats, then jump to any step.
+
+    A simulation x0, x1 = step(x0), x2 = step(x1), ... that only has finitely
+    many states eventually cycles: from some start on, the states repeat every
+    period steps, and state n is state start + (n - start) % period.
+
+    find_cycle keeps a fingerprint of each state in a dict, plus a projection
+    of it (whatever the answer needs, say a load or a count), so the answer at
+    step n is read from the history without simulating again. brent keeps only
+    two states whatever the length of the cycle, at the cost of a few more calls
+    to step, and needs step to return a new state rather than update it.
+"""
+
+from collections.abc import Callable, Hashable
+
+
+def fingerprint(state) -> int:
+    """A 64-bit hash of a state, bytes-like ones included."""
+    if isinstance(state, (bytearray, memoryview)):
+        state = bytes(state)
+    return hash(state)
+
+
+def find_cycle(
+    step: Callable,
+    state,
+    project: Callable = lambda state: state,
+    key: Callable[..., Hashable] = fingerprint,
+    limit: int | None = None,
+) -> tuple[int, int, list]:
+    """Iterate step from state until key(state) repeats, or for limit steps.
+    Return (start, period, history): history holds project(x) for the states
+    x0, x1, ... seen until then, period is 0 if no repeat was found. step may
+    update the state in place, key and project see each state before the next
+    step."""
+    seen = {}
+    history = []
+    while limit is None or len(history) <= limit:
+        fingerprinted = key(state)
+        if (start := seen.get(fingerprinted)) is not None:
+            return start, len(history) - start, history
+        seen[fingerprinted] = len(history)
+        history.append(project(state))
+        state = step(state)
+    return len(history), 0, history
+
+
+def at_step(n: int, start: int, period: int, history: list):
+    """The projection of state n, read from the result of find_cycle."""
+    if n < len(history):
+        return history[n]
+    if not period:
+        raise IndexError(f"step {n} is past the history and no cycle was found")
+    return history[start + (n - start) % period]
+
+
+def brent(
+    step: Callable, state, key: Callable = lambda state: state
+) -> tuple[int, int]:
+    """(start, period) of the sequence from state, with Brent's algorithm."""
+    # Find the period: the hare runs ahead in powers of two, the tortoise waits
+    # at the last power of two, they meet once the hare has gone round once.
+    power = period = 1
+    tortoise, hare = state, step(state)
+    while key(tortoise) != key(hare):
+        if power == period:
+            tortoise, power, period = hare, power * 2, 0
+        hare = step(hare)
+        period += 1
+
+    # Find the start: two states period apart meet at the start of the cycle.
+    tortoise = hare = state
+    for _ in range(period):
+        hare = step(hare)
+    start = 0
+    while key(tortoise) != key(hare):
+        tortoise, hare = step(tortoise), step(hare)
+        start += 1
+    return start, period
+
+
+def test_find_cycle():
+    def step(x):
+        return (x * x + 1) % 255
+
+    states = [3]
+    for _ in range(100):
+        states.append(step(states[-1]))
+    start, period, history = find_cycle(step, 3, project=lambda x: -x)
+    assert states[start] == states[start + period] and period > 1
+    assert states[start - 1] != states[start + period - 1]
+    assert all(at_step(n, start, period, history) == -states[n] for n in range(100))
+    assert brent(step, 3) == (start, period)
+
+
+def test_find_cycle_in_place():
+    def step(counter):
+        counter[0] = (counter[0] + 1) % 5
+        return counter
+
+    start, period, history = find_cycle(step, bytearray([3]), project=lambda c: c[0])
+    assert (start, period, history) == (0, 5, [3, 4, 0, 1, 2])
+    assert at_step(10**9 + 1, start, period, history) == 4
+
+
+def test_find_cycle_limit():
+    start, period, history = find_cycle(lambda x: x + 1, 0, limit=5)
+    assert (start, period, history) == (6, 0, [0, 1, 2, 3, 4, 5])
+    assert at_step(5, start, period, history) == 5
+    try:
+        at_step(6, start, period, history)
+    except IndexError:
+        pass
+    else:
+        assert False, "no cycle, no step past the history"
@@ -0,0 +1,128 @@
+"""
+    Advent of Code 2023
+    Grid: a rectangular grid of ASCII cells kept in one flat bytes buffer.
+
+    Rows are stored as in the input file, newline included (Windows line breaks
+    lose their carriage return), so the flat index of (row, col) is
+    row * stride + col with stride = width + 1. Moving left or right off the
+    grid lands on a newline and moving up or down lands outside the buffer, so
+    a single check on the flat index tells the border.
+"""
+
+from collections.abc import Iterator
+
+NEWLINE = ord("\n")
+
+
+class Grid:
+    __slots__ = ("data", "height", "stride", "width")
+
+    def __init__(self, data: bytes | bytearray):
+        if b"\r" in data:  # Windows line breaks, the stride assumes "\n"
+            data = data.replace(b"\r\n", b"\n")
+        if not data.endswith(b"\n"):
+            data = data + b"\n"
+        self.data = data
+        self.width = data.index(b"\n")
+        self.stride = self.width + 1
+        self.height = len(data) // self.stride
+
+    @classmethod
+    def from_file(cls, file_name: str) -> "Grid":
+        with open(file_name, "rb") as data_file:
+            return cls(data_file.read())
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> "Grid":
+        return cls("".join(line + "\n" for line in lines).encode("ascii"))
+
+    def copy(self) -> "Grid":
+        """A mutable copy, backed by a bytearray."""
+        return Grid(bytearray(self.data))
+
+    def index(self, row: int, col: int) -> int:
+        return row * self.stride + col
+
+    def position(self, index: int) -> tuple[int, int]:
+        return divmod(index, self.stride)
+
+    def in_bounds(self, index: int) -> bool:
+        return 0 <= index < len(self.data) and self.data[index] != NEWLINE
+
+    @property
+    def deltas4(self) -> tuple[int, int, int, int]:
+        """Flat index offsets of the up, down, left and right neighbours."""
+        return (-self.stride, self.stride, -1, 1)
+
+    @property
+    def deltas8(self) -> tuple[int, ...]:
+        s = self.stride
+        return (-s - 1, -s, -s + 1, -1, 1, s - 1, s, s + 1)
+
+    def find_all(self, symbol: bytes) -> Iterator[int]:
+        index = self.data.find(symbol)
+        while index != -1:
+            yield index
+            index = self.data.find(symbol, index + 1)
+
+    def row(self, row: int) -> memoryview:
+        start = row * self.stride
+        return memoryview(self.data)[start : start + self.width]
+
+    def col(self, col: int) -> memoryview:
+        return memoryview(self.data)[col :: self.stride]
+
+    def rows(self) -> list[memoryview]:
+        return [self.row(r) for r in range(self.height)]
+
+    def cols(self) -> list[memoryview]:
+        """The columns, i.e. the rows of the transposed grid, without copying."""
+        return [self.col(c) for c in range(self.width)]
+
+    def array(self):
+        """A (height, width) uint8 NumPy view of the cells, sharing the buffer.
+        Its .T attribute is the transposed grid, still without copying."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        flat = np.frombuffer(self.data, dtype=np.uint8)
+        return flat.reshape(self.height, self.stride)[:, : self.width]
+
+    def __str__(self) -> str:
+        return self.data.decode("ascii")
+
+
+def test_grid_indexing():
+    grid = Grid.from_lines(["ab", "cd", "ef"])
+    assert (grid.height, grid.width, grid.stride) == (3, 2, 3)
+    assert chr(grid.data[grid.index(2, 1)]) == "f"
+    assert grid.position(grid.index(2, 1)) == (2, 1)
+    assert Grid(b"ab\ncd\nef").data == grid.data
+    assert Grid(b"ab\r\ncd\r\nef\r\n").data == grid.data
+
+
+def test_grid_borders():
+    grid = Grid.from_lines(["ab", "cd"])
+    up, down, left, right = grid.deltas4
+    top_left, bottom_right = grid.index(0, 0), grid.index(1, 1)
+    assert grid.in_bounds(top_left) and grid.in_bounds(bottom_right)
+    assert not grid.in_bounds(top_left + up)
+    assert not grid.in_bounds(top_left + left)
+    assert not grid.in_bounds(bottom_right + down)
+    assert not grid.in_bounds(bottom_right + right)
+
+
+def test_grid_views():
+    grid = Grid.from_lines(["abc", "def"])
+    assert [bytes(row) for row in grid.rows()] == [b"abc", b"def"]
+    assert [bytes(col) for col in grid.cols()] == [b"ad", b"be", b"cf"]
+    assert list(grid.find_all(b"e")) == [grid.index(1, 1)]
+    mutable = grid.copy()
+    mutable.data[0] = ord("z")
+    assert str(grid).startswith("abc") and str(mutable).startswith("zbc")
+
+
+def test_grid_array():
+    grid = Grid.from_lines(["abc", "def"])
+    array = grid.array()
+    assert array.shape == (2, 3)
+    assert bytes(array.T[2]) == b"cf"
@@ -0,0 +1,157 @@
+"""
+    Advent of Code 2023
+    Intervals: half-open integer intervals and the boxes they span.
+
+    An interval is a (start, end) tuple holding start <= x < end, a box is a
+    tuple of intervals, one per dimension. Both are plain tuples, so that
+    splitting one allocates a couple of tuples and no dict. Functions taking a
+    list of intervals work on all of them in one sorted sweep rather than rule
+    by rule.
+"""
+
+from bisect import bisect_right
+from collections.abc import Iterable
+from itertools import pairwise
+from math import prod
+
+Interval = tuple[int, int]
+Box = tuple[Interval, ...]
+# Points in start <= x < end move to x + offset.
+Shift = tuple[int, int, int]
+
+
+def length(interval: Interval) -> int:
+    start, end = interval
+    return max(0, end - start)
+
+
+def intersect(a: Interval, b: Interval) -> Interval | None:
+    start, end = max(a[0], b[0]), min(a[1], b[1])
+    return (start, end) if start < end else None
+
+
+def split(interval: Interval, at: int) -> tuple[Interval | None, Interval | None]:
+    """The parts of interval below at and from at on, None when empty."""
+    start, end = interval
+    if at <= start:
+        return None, interval
+    if at >= end:
+        return interval, None
+    return (start, at), (at, end)
+
+
+def normalize(intervals: Iterable[Interval]) -> list[Interval]:
+    """The union of intervals, as sorted intervals that neither overlap nor
+    touch."""
+    union = []
+    for start, end in sorted(intervals):
+        if start >= end:
+            continue
+        if union and start <= union[-1][1]:
+            if end > union[-1][1]:
+                union[-1] = (union[-1][0], end)
+        else:
+            union.append((start, end))
+    return union
+
+
+def shift_point(x: int, shifts: list[Shift]) -> int:
+    """Map x through shifts, sorted and not overlapping."""
+    index = bisect_right(shifts, x, key=lambda shift: shift[0]) - 1
+    if index >= 0 and x < shifts[index][1]:
+        return x + shifts[index][2]
+    return x
+
+
+def shift(intervals: Iterable[Interval], shifts: list[Shift]) -> list[Interval]:
+    """Map the points of intervals through shifts, sorted and not overlapping:
+    points in none of them stay where they are. Returns the union of the
+    images, normalized."""
+    images = []
+    for start, end in normalize(intervals):
+        # The first shift that ends after start, found by bisecting.
+        index = max(0, bisect_right(shifts, start, key=lambda shift: shift[0]) - 1)
+        if index < len(shifts) and shifts[index][1] <= start:
+            index += 1
+        while start < end:
+            if index == len(shifts) or shifts[index][0] >= end:
+                images.append((start, end))
+                break
+            shift_start, shift_end, offset = shifts[index]
+            if start < shift_start:
+                images.append((start, shift_start))
+                start = shift_start
+            stop = min(end, shift_end)
+            images.append((start + offset, stop + offset))
+            start = stop
+            index += 1
+    return normalize(images)
+
+
+def volume(box: Box) -> int:
+    return prod(length(interval) for interval in box)
+
+
+def intersect_box(a: Box, b: Box) -> Box | None:
+    box = []
+    for interval_a, interval_b in zip(a, b):
+        interval = intersect(interval_a, interval_b)
+        if interval is None:
+            return None
+        box.append(interval)
+    return tuple(box)
+
+
+def split_box(box: Box, axis: int, at: int) -> tuple[Box | None, Box | None]:
+    """The parts of box below at and from at on along axis, None when empty."""
+    below, above = split(box[axis], at)
+    return (
+        below and box[:axis] + (below,) + box[axis + 1 :],
+        above and box[:axis] + (above,) + box[axis + 1 :],
+    )
+
+
+def union_volume(boxes: Iterable[Box]) -> int:
+    """Volume of the union of boxes, overlapping ones counted once."""
+    boxes = [box for box in boxes if volume(box)]
+    if not boxes:
+        return 0
+    if len(boxes[0]) == 1:
+        return sum(map(length, normalize(box[0] for box in boxes)))
+    # Cut the first axis into slabs at every start and end, each slab adds its
+    # width times the union of the boxes across it, one dimension lower.
+    cuts = sorted({x for box in boxes for x in box[0]})
+    total = 0
+    for low, high in pairwise(cuts):
+        across = [box[1:] for box in boxes if box[0][0] <= low and high <= box[0][1]]
+        if across:
+            total += (high - low) * union_volume(across)
+    return total
+
+
+def test_intervals():
+    assert normalize([(5, 7), (1, 3), (2, 4), (4, 4), (7, 9)]) == [(1, 4), (5, 9)]
+    assert intersect((1, 5), (3, 8)) == (3, 5) and intersect((1, 3), (3, 5)) is None
+    assert split((1, 5), 3) == ((1, 3), (3, 5))
+    assert split((1, 5), 0) == (None, (1, 5)) and split((1, 5), 5) == ((1, 5), None)
+    assert length((3, 1)) == 0
+
+
+def test_shift():
+    # 50 98 2 and 52 50 48 in day 5's terms: 98, 99 go to 50, 51 and 50-97 up 2.
+    shifts = [(50, 98, 2), (98, 100, -48)]
+    assert shift([(79, 93), (55, 68)], shifts) == [(57, 70), (81, 95)]
+    assert shift([(0, 200)], shifts) == [(0, 200)]
+    assert shift([(40, 55), (99, 101)], shifts) == [(40, 50), (51, 57), (100, 101)]
+    points = [shift_point(x, shifts) for x in (49, 50, 97, 98, 99, 100)]
+    assert points == [49, 52, 99, 50, 51, 100]
+
+
+def test_boxes():
+    box = ((1, 4001),) * 4
+    below, above = split_box(box, 1, 2000)
+    assert below[1] == (1, 2000) and above[1] == (2000, 4001) and below[0] == box[0]
+    assert volume(below) + volume(above) == volume(box) == 4000**4
+    assert split_box(box, 0, 1) == (None, box)
+    assert intersect_box(((0, 2), (0, 2)), ((1, 3), (2, 3))) is None
+    assert union_volume([((0, 2), (0, 2)), ((1, 3), (1, 3)), ((5, 5), (0, 9))]) == 7
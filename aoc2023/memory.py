@@ -0,0 +1,94 @@
+"""
+    Advent of Code 2023
+    Memory: peak allocation of a call (tracemalloc) and peak RSS of the process.
+
+    tracemalloc counts the Python allocations made during the call and still
+    alive at its peak, so it isolates one phase; the peak RSS of the process
+    also includes the interpreter and whatever earlier phases left behind.
+"""
+
+import sys
+
+# tracemalloc (which pulls in pickle) and resource are imported on use: the
+# memory budget tests of the solution modules import this one.
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process so far, in bytes."""
+    import resource  # pylint: disable=import-outside-toplevel
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(func, *args):
+    """Call func(*args), return its result and peak traced allocation in bytes."""
+    import tracemalloc  # pylint: disable=import-outside-toplevel
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = func(*args)
+        return result, tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+class MemoryBudgetExceeded(AssertionError):
+    pass
+
+
+class memory_budget:  # pylint: disable=invalid-name
+    """Fail with MemoryBudgetExceeded if the block allocates over limit bytes
+    at its peak. The peak is kept in the peak attribute."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.peak = 0
+        self.started = False
+
+    def __enter__(self) -> "memory_budget":
+        import tracemalloc  # pylint: disable=import-outside-toplevel
+
+        self.started = not tracemalloc.is_tracing()
+        if self.started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self.baseline = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, exc_type, *_) -> None:
+        import tracemalloc  # pylint: disable=import-outside-toplevel
+
+        self.peak = tracemalloc.get_traced_memory()[1] - self.baseline
+        if self.started:
+            tracemalloc.stop()
+        if exc_type is None and self.peak > self.limit:
+            raise MemoryBudgetExceeded(
+                f"peak allocation {self.peak:,} bytes over budget {self.limit:,}"
+            )
+
+
+def test_measure():
+    result, peak = measure(bytearray, 1_000_000)
+    assert len(result) == 1_000_000
+    assert 1_000_000 <= peak < 1_100_000
+    assert peak_rss() > 1_000_000
+
+
+def test_memory_budget():
+    with memory_budget(2_000_000) as budget:
+        bytearray(1_000_000)
+    assert 1_000_000 <= budget.peak < 2_000_000
+
+    try:
+        with memory_budget(100_000):
+            bytearray(1_000_000)
+    except MemoryBudgetExceeded as exc:
+        assert "over budget 100,000" in str(exc)
+    else:
+        assert False, "budget not enforced"
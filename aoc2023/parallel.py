@@ -0,0 +1,120 @@
+"""
+    Advent of Code 2023
+    Parallel: run independent work items on threads, subinterpreters or processes.
+
+    Threads only pay off on a free-threaded build, where they run on every core
+    and share the work items without copying them. With the GIL, subinterpreters
+    (InterpreterPoolExecutor, Python 3.14) each get their own, and a process pool
+    is the fallback. Solvers call pmap, which is a plain map until configure
+    picks a backend, so tests and single runs stay serial.
+"""
+
+import os
+import sys
+
+BACKENDS = ("serial", "thread", "interpreter", "process")
+
+backend = "serial"
+jobs = os.cpu_count() or 1
+executor = None  # created by the first pmap after configure
+
+
+def free_threaded() -> bool:
+    return not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def available_backends() -> list[str]:
+    import concurrent.futures  # pylint: disable=import-outside-toplevel
+
+    return [
+        name
+        for name in BACKENDS
+        if name != "interpreter"
+        or hasattr(concurrent.futures, "InterpreterPoolExecutor")
+    ]
+
+
+def default_backend() -> str:
+    if free_threaded():
+        return "thread"
+    if "interpreter" in available_backends():
+        return "interpreter"
+    return "process"
+
+
+def make_executor(name: str, max_workers: int | None = None):
+    """An executor for backend name, or None for serial. The workers of the
+    interpreter and process backends run their own pmap calls serially."""
+    # pylint: disable=import-outside-toplevel
+    import concurrent.futures
+
+    if name == "serial":
+        return None
+    if name == "thread":
+        return concurrent.futures.ThreadPoolExecutor(max_workers)
+    if name == "interpreter":
+        # A new interpreter starts from a default sys.path, without the repository.
+        setup = f"import sys; sys.path[:0] = {sys.path!r}"
+        return concurrent.futures.InterpreterPoolExecutor(
+            max_workers, initializer=exec, initargs=(setup, {})
+        )
+    if name == "process":
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers, initializer=init_worker
+        )
+    raise ValueError(f"unknown backend {name!r}, expected one of {BACKENDS}")
+
+
+def init_worker() -> None:
+    # A forked worker inherits the parent executor, which is not its own to shut down.
+    global backend, executor  # pylint: disable=global-statement
+    backend, executor = "serial", None
+
+
+def configure(name: str = "serial", max_workers: int | None = None) -> None:
+    global backend, jobs, executor  # pylint: disable=global-statement
+    if name not in BACKENDS:
+        raise ValueError(f"unknown backend {name!r}, expected one of {BACKENDS}")
+    if executor is not None:
+        executor.shutdown()
+    backend, jobs, executor = name, max_workers or os.cpu_count() or 1, None
+
+
+def run_chunk(func, chunk: list) -> list:
+    return [func(item) for item in chunk]
+
+
+def pmap(func, items) -> list:
+    """list(map(func, items)) on the configured backend. Items are sent in one
+    chunk per worker, so func and the data it closes over (say a partial over
+    the grid) are pickled once per worker rather than once per item."""
+    global executor  # pylint: disable=global-statement
+    items = list(items)
+    if backend == "serial" or len(items) < 2:
+        return [func(item) for item in items]
+    if executor is None:
+        executor = make_executor(backend, jobs)
+    size = -(-len(items) // jobs)
+    chunks = [items[i : i + size] for i in range(0, len(items), size)]
+    return [
+        result
+        for chunk in executor.map(run_chunk, [func] * len(chunks), chunks)
+        for result in chunk
+    ]
+
+
+def test_pmap():
+    try:
+        for name in available_backends():
+            configure(name, 2)
+            assert pmap(abs, range(-5, 5)) == [5, 4, 3, 2, 1, 0, 1, 2, 3, 4]
+            assert pmap(abs, []) == []
+    finally:
+        configure()
+    assert backend == "serial" and executor is None
+
+
+def test_default_backend():
+    assert default_backend() in available_backends()
+    if not free_threaded():
+        assert default_backend() != "thread"
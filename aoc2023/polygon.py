@@ -0,0 +1,79 @@
+"""
+    Advent of Code 2023
+    Polygon: area and lattice points of a polygon, from a stream of vertices.
+
+    The shoelace formula sums x1 * y2 - x2 * y1 over the edges for twice the
+    area, and an edge from (x1, y1) to (x2, y2) holds gcd(|x2 - x1|, |y2 - y1|)
+    lattice points besides its start. Pick's theorem, A = I + B / 2 - 1, then
+    gives the number I of lattice points strictly inside. Everything is integer
+    arithmetic over one pass, holding only the previous vertex.
+"""
+
+from collections.abc import Iterable, Iterator
+from math import gcd
+
+Point = tuple[int, int]
+
+
+def straight(a: Point, b: Point, c: Point) -> bool:
+    """Whether b is on the way from a to c along a straight line."""
+    (ax, ay), (bx, by), (cx, cy) = a, b, c
+    collinear = (bx - ax) * (cy - by) == (by - ay) * (cx - bx)
+    return collinear and (bx - ax) * (cx - bx) + (by - ay) * (cy - by) > 0
+
+
+def corners(points: Iterable[Point]) -> Iterator[Point]:
+    """points without the ones in the middle of a straight run, so that a path
+    given cell by cell becomes one vertex per turn."""
+    points = iter(points)
+    anchor = next(points, None)
+    if anchor is None:
+        return
+    yield anchor
+    pending = None
+    for point in points:
+        if pending is not None:
+            if straight(anchor, pending, point):
+                pending = point
+                continue
+            yield pending
+            anchor = pending
+        pending = point
+    if pending is not None:
+        yield pending
+
+
+def measure(points: Iterable[Point]) -> tuple[int, int, int]:
+    """(twice the area, boundary points, interior points) of the polygon whose
+    vertices are points, closed from the last back to the first."""
+    twice_area = boundary = 0
+    first = previous = None
+    for point in corners(points):
+        if previous is not None:
+            (xa, ya), (xb, yb) = previous, point
+            twice_area += xa * yb - ya * xb
+            boundary += gcd(xb - xa, yb - ya)
+        else:
+            first = point
+        previous = point
+    if first is None:
+        return 0, 0, 0
+    (xa, ya), (xb, yb) = previous, first
+    twice_area = abs(twice_area + xa * yb - ya * xb)
+    boundary += gcd(xb - xa, yb - ya)
+    return twice_area, boundary, (twice_area - boundary) // 2 + 1
+
+
+def test_corners():
+    path = [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2), (2, 1), (2, 0), (1, 0)]
+    assert list(corners(path)) == [(0, 0), (0, 2), (2, 2), (2, 0), (1, 0)]
+    assert list(corners([(0, 0), (0, 2), (0, 1)])) == [(0, 0), (0, 2), (0, 1)]
+    assert not list(corners([]))
+
+
+def test_measure():
+    square = [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2), (2, 1), (2, 0), (1, 0)]
+    assert measure(square) == measure(reversed(square)) == (8, 8, 1)
+    # A right triangle whose hypotenuse crosses lattice points at (2, 1).
+    assert measure([(0, 0), (4, 0), (0, 2)]) == (8, 8, 1)
+    assert measure([]) == (0, 0, 0)
@@ -0,0 +1,172 @@
+"""
+    Advent of Code 2023
+    Profiler: sample the stack of a running day, export flame graphs.
+
+    A background thread wakes up every interval, reads the current frame of
+    the thread running the day (sys._current_frames) and counts its stack.
+    Nothing is hooked into the calls themselves, so generators and small
+    functions cost what they cost without a profiler, unlike with cProfile.
+    The sampler needs the GIL to run: the switch interval is lowered to the
+    sampling interval while profiling, or the day would hold it for 5 ms.
+
+    The stacks export as collapsed lines ("outer;inner;leaf count", for
+    flamegraph.pl and most flame graph tools) or as a speedscope file.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+Frame = tuple[str, str, int]  # function, file, first line
+Stack = tuple[Frame, ...]  # outermost first
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+class Profile:
+    """Stacks sampled while a call ran, with the result of the call."""
+
+    __slots__ = ("name", "result", "seconds", "stacks")
+
+    def __init__(self, name: str, result, stacks: Counter, seconds: float):
+        self.name = name
+        self.result = result
+        self.stacks = stacks
+        self.seconds = seconds
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        return "".join(
+            ";".join(label(frame) for frame in stack) + f" {count}\n"
+            for stack, count in sorted(self.stacks.items())
+        )
+
+    def speedscope(self) -> dict:
+        frames: dict[Frame, int] = {}
+        samples, weights = [], []
+        # Each sample stands for the average time between two samples.
+        period = self.seconds / max(1, self.samples)
+        for stack, count in self.stacks.items():
+            samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+            weights.append(count * period)
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": self.name,
+            "exporter": "aoc2023.profiler",
+            "activeProfileIndex": 0,
+            "shared": {
+                "frames": [
+                    {"name": name, "file": file, "line": line}
+                    for name, file, line in frames
+                ]
+            },
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": self.name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": self.seconds,
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+    def top(self, limit: int = 10) -> list[tuple[Frame, int, int]]:
+        """(frame, samples in it, samples in it or its callees) of the frames
+        most often running."""
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for frame in set(stack):
+                total[frame] += count
+        return [(frame, count, total[frame]) for frame, count in own.most_common(limit)]
+
+
+def label(frame: Frame) -> str:
+    name, file, line = frame
+    return f"{name} ({os.path.basename(file)}:{line})"
+
+
+def stack_of(frame, root) -> Stack | None:
+    """The frames from frame out to the one running the code root (excluded),
+    outermost first, or None if root is not running."""
+    stack = []
+    while frame is not None and frame.f_code is not root:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    return tuple(reversed(stack)) if frame is not None else None
+
+
+def profile(func, *args, interval: float = 0.001, name: str | None = None) -> Profile:
+    """Call func(*args), sampling its stack every interval seconds."""
+    thread_id = threading.get_ident()
+    stacks = Counter()
+    done = threading.Event()
+
+    def call():
+        # Samples are the stacks above this frame, so that the profiler's own
+        # frames, before and after the call, are never counted.
+        return func(*args)
+
+    def sample():
+        while not done.wait(interval):
+            frame = sys._current_frames().get(thread_id)  # pylint: disable=protected-access
+            if stack := stack_of(frame, call.__code__):
+                stacks[stack] += 1
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(min(switch_interval, interval))
+    sampler = threading.Thread(target=sample, name="aoc2023-profiler", daemon=True)
+    start = time.perf_counter()
+    sampler.start()
+    try:
+        result = call()
+    finally:
+        seconds = time.perf_counter() - start
+        done.set()
+        sampler.join()
+        sys.setswitchinterval(switch_interval)
+    return Profile(
+        name or getattr(func, "__name__", "profile"), result, stacks, seconds
+    )
+
+
+def format_top(run: Profile, limit: int = 10) -> str:
+    samples = max(1, run.samples)
+    lines = [
+        f"{run.name}: {run.samples} samples in {run.seconds:.3f}s",
+        f"{'own':>6} {'total':>6}  function",
+    ]
+    lines.extend(
+        f"{own / samples:>6.1%} {total / samples:>6.1%}  {label(frame)}"
+        for frame, own, total in run.top(limit)
+    )
+    return "\n".join(lines)
+
+
+def busy(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def test_profile():
+    run = profile(busy, 2_000_000, interval=0.0005)
+    assert run.result == busy(2_000_000) and run.samples > 0
+    assert all(stack[0][0] == "busy" for stack in run.stacks)
+    (frame, own, total), *_ = run.top(1)
+    assert frame[0] in ("busy", "<genexpr>") and 0 < own <= total <= run.samples
+
+    assert run.collapsed().startswith("busy (profiler.py:")
+    speedscope = run.speedscope()
+    sampled = speedscope["profiles"][0]
+    assert len(sampled["samples"]) == len(sampled["weights"]) == len(run.stacks)
+    frames = speedscope["shared"]["frames"]
+    assert {frame["name"] for frame in frames} <= {"busy", "<genexpr>"}
+    assert "samples in" in format_top(run)
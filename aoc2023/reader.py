@@ -0,0 +1,108 @@
+"""
+    Advent of Code 2023
+    Reader: stream the lines, or blank-line separated blocks, of an input file.
+
+    The file is mapped with mmap and every line is sliced out as bytes when it
+    is reached, so only the current line (or block) is ever held in memory
+    whatever the size of the file. Lines and Blocks are lazy sequences that can
+    be iterated again, once per part, and pickle as just their file name.
+"""
+
+import mmap
+import os
+from collections.abc import Callable, Iterator
+
+
+def lines(file_name: str) -> Iterator[bytes]:
+    """The lines of a file without their line breaks."""
+    with open(file_name, "rb") as data_file:
+        try:
+            data = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # an empty file cannot be mapped
+            return
+    with data:
+        start, size = 0, len(data)
+        while start < size:
+            end = data.find(b"\n", start)
+            if end == -1:
+                end = size
+            yield data[start:end]
+            start = end + 1
+
+
+def blocks(file_name: str) -> Iterator[list[bytes]]:
+    """The groups of lines separated by blank lines."""
+    block = []
+    for line in lines(file_name):
+        if line:
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+class Lines:
+    """The lines of a file, each passed through parse_line if given."""
+
+    __slots__ = ("file_name", "parse_line")
+
+    def __init__(
+        self, file_name: str, parse_line: Callable[[bytes], object] | None = None
+    ):
+        os.stat(file_name)  # a missing input fails here, not in the first part
+        self.file_name = file_name
+        self.parse_line = parse_line
+
+    def __iter__(self) -> Iterator:
+        if self.parse_line is None:
+            return lines(self.file_name)
+        return map(self.parse_line, lines(self.file_name))
+
+
+class Blocks:
+    """The blocks of a file, each passed through parse_block if given."""
+
+    __slots__ = ("file_name", "parse_block")
+
+    def __init__(
+        self, file_name: str, parse_block: Callable[[list[bytes]], object] | None = None
+    ):
+        os.stat(file_name)
+        self.file_name = file_name
+        self.parse_block = parse_block
+
+    def __iter__(self) -> Iterator:
+        if self.parse_block is None:
+            return blocks(self.file_name)
+        return map(self.parse_block, blocks(self.file_name))
+
+
+def test_lines(tmp_path):
+    input_file = tmp_path / "input.txt"
+    for content in (b"ab\ncd\n", b"ab\ncd"):
+        input_file.write_bytes(content)
+        assert list(lines(input_file)) == [b"ab", b"cd"]
+    input_file.write_bytes(b"")
+    assert list(lines(input_file)) == []
+
+    input_file.write_bytes(b"1 2\n3 4\n")
+    numbers = Lines(input_file, lambda line: sum(map(int, line.split())))
+    assert list(numbers) == list(numbers) == [3, 7]
+
+
+def test_blocks(tmp_path):
+    input_file = tmp_path / "input.txt"
+    input_file.write_bytes(b"a\nb\n\nc\n\n\nd")
+    assert list(blocks(input_file)) == [[b"a", b"b"], [b"c"], [b"d"]]
+    assert list(Blocks(input_file, len)) == [2, 1, 1]
+
+
+def test_lines_memory(tmp_path):
+    from aoc2023.memory import memory_budget  # pylint: disable=import-outside-toplevel
+
+    input_file = tmp_path / "input.txt"
+    input_file.write_bytes((b"0123456789" * 10 + b"\n") * 50_000)
+    with memory_budget(50_000):
+        assert sum(len(line) for line in lines(input_file)) == 5_000_000
@@ -0,0 +1,337 @@
+"""
+    Advent of Code 2023
+    Runner: discover the daily solutions and solve them on a process pool.
+"""
+
+import functools
+import importlib
+import os
+import re
+import time
+from collections.abc import Iterator
+from concurrent.futures import as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from aoc2023 import cache, counters, memory, parallel
+
+ROOT = Path(__file__).resolve().parent.parent
+MODULE_PATTERN = re.compile(r"aoc2023_day(\d\d)\.py")
+DEFAULT_INPUTS = "data/day{day:02d}.txt"
+DEFAULT_ANSWER_CACHE = ".aoc_cache/answers"
+
+
+@dataclass(frozen=True)
+class Result:
+    day: int
+    part: int  # 0 is the parse_input phase, 1 and 2 are the puzzle parts
+    answer: Any
+    seconds: float
+    error: str | None = None
+    counters: dict[str, int] | None = None
+    peak_memory: int | None = None  # bytes allocated at the peak of the phase
+    peak_rss: int | None = None  # bytes, of the whole process so far
+    cached: bool = False  # from the answer cache, seconds is the original time
+
+
+def discover_days(root: Path = ROOT) -> list[int]:
+    return sorted(
+        int(match.group(1))
+        for path in root.glob("aoc2023_day*.py")
+        if (match := MODULE_PATTERN.fullmatch(path.name))
+    )
+
+
+def parse_days(spec: str) -> list[int]:
+    """Parse a day selection such as "1-20" or "1,3,5-7"."""
+    days = set()
+    for item in spec.split(","):
+        first, _, last = item.strip().partition("-")
+        days.update(range(int(first), int(last or first) + 1))
+    return sorted(days)
+
+
+def module_name(day: int) -> str:
+    return f"aoc2023_day{day:02d}"
+
+
+def load_day(day: int) -> ModuleType:
+    return importlib.import_module(module_name(day))
+
+
+def part_function(module: ModuleType, day: int, part: int):
+    return getattr(module, f"day{day:02d}_part{part}")
+
+
+def timed(func, *args) -> tuple[Any, float]:
+    start = time.perf_counter()
+    answer = func(*args)
+    return answer, time.perf_counter() - start
+
+
+def run_day(
+    day: int,
+    input_path: str,
+    count: bool = False,
+    trace_memory: bool = False,
+    answer_cache: str | None = None,
+    force: bool = False,
+) -> list[Result]:
+    """Solve one day, or return the answers stored in answer_cache for the
+    same code and input unless force is set. Counting operations or tracing
+    memory (with tracemalloc, a few times slower) always solves."""
+    key = None
+    if answer_cache and not (count or trace_memory):
+        try:
+            key = cache.answer_key(module_name(day), input_path)
+        except OSError:
+            pass  # solve_day reports the missing input
+    if key and not force and (entries := cache.load_answers(answer_cache, key)):
+        return [
+            Result(day, part, answer, seconds, cached=True)
+            for part, answer, seconds in entries
+        ]
+
+    results = solve_day(day, input_path, count, trace_memory)
+    if key and not any(result.error for result in results):
+        cache.save_answers(
+            answer_cache,
+            key,
+            [(result.part, result.answer, result.seconds) for result in results],
+        )
+    return results
+
+
+def solve_day(
+    day: int, input_path: str, count: bool, trace_memory: bool
+) -> list[Result]:
+    counters.enable(count)
+
+    def run_phase(part, func, arg):
+        counters.reset()
+        peak = rss = None
+        if trace_memory:
+            (answer, seconds), peak = memory.measure(timed, func, arg)
+            rss = memory.peak_rss()
+        else:
+            answer, seconds = timed(func, arg)
+        snapshot = counters.snapshot() if count else None
+        return answer, Result(
+            day, part, answer if part else None, seconds, None, snapshot, peak, rss
+        )
+
+    try:
+        module = load_day(day)
+        data, result = run_phase(0, module.parse_input, input_path)
+    except Exception as exc:  # pylint: disable=broad-except
+        return [Result(day, 0, None, 0.0, repr(exc))]
+
+    results = [result]
+    for part in (1, 2):
+        try:
+            _, result = run_phase(part, part_function(module, day, part), data)
+        except Exception as exc:  # pylint: disable=broad-except
+            result = Result(day, part, None, 0.0, repr(exc))
+        results.append(result)
+    return results
+
+
+def run(
+    days: list[int],
+    jobs: int | None = None,
+    inputs: str = DEFAULT_INPUTS,
+    count: bool = False,
+    backend: str = "process",
+    trace_memory: bool = False,
+    answer_cache: str | None = None,
+    force: bool = False,
+) -> list[Result]:
+    """Solve the days on the workers of backend (see parallel.py). A single
+    day is solved here instead, its own work items going to the workers,
+    unless counting or tracing memory: those only see this process, so the
+    work items of the day then run here too."""
+    if (count or trace_memory) and backend == "thread" and len(days) > 1:
+        raise ValueError("counters and memory are per process, use another backend")
+    solve = functools.partial(
+        run_day,
+        count=count,
+        trace_memory=trace_memory,
+        answer_cache=answer_cache,
+        force=force,
+    )
+    results = []
+    if backend == "serial" or len(days) == 1:
+        parallel.configure("serial" if count or trace_memory else backend, jobs)
+        try:
+            for day in days:
+                results.extend(solve(day, inputs.format(day=day)))
+        finally:
+            parallel.configure()
+    else:
+        with parallel.make_executor(backend, jobs) as executor:
+            futures = [
+                executor.submit(solve, day, inputs.format(day=day)) for day in days
+            ]
+            for future in as_completed(futures):
+                results.extend(future.result())
+    return sorted(results, key=lambda result: (result.day, result.part))
+
+
+def input_paths(specs: list[str]) -> list[str]:
+    """Input files named by specs, a directory standing for its .txt files."""
+    paths = []
+    for spec in specs:
+        if os.path.isdir(spec):
+            paths.extend(sorted(str(path) for path in Path(spec).glob("*.txt")))
+        else:
+            paths.append(spec)
+    return paths
+
+
+def solve_many(
+    day: int,
+    paths: list[str],
+    jobs: int | None = None,
+    backend: str = "serial",
+    answer_cache: str | None = None,
+    force: bool = False,
+) -> Iterator[tuple[str, list[Result]]]:
+    """Solve day for every input of paths, yielding (path, results) in order
+    as they are solved. The module is imported once per process, so the
+    tables it builds at import or memoizes are shared by all the inputs."""
+    solve = functools.partial(run_day, day, answer_cache=answer_cache, force=force)
+    if backend == "serial":
+        for path in paths:
+            yield path, solve(path)
+        return
+    with parallel.make_executor(backend, jobs) as executor:
+        yield from zip(paths, executor.map(solve, paths))
+
+
+def format_table(results: list[Result]) -> str:
+    traced = any(result.peak_memory is not None for result in results)
+    header = f"{'Day':>3} {'Part':>5} {'Time (ms)':>10}"
+    if traced:
+        header += f" {'Peak (KiB)':>11} {'RSS (MiB)':>10}"
+    lines = [header + "  Answer"]
+    for result in results:
+        part = "parse" if result.part == 0 else str(result.part)
+        answer = result.error if result.error else result.answer
+        if result.part == 0 and not result.error:
+            answer = ""
+        line = f"{result.day:>3} {part:>5} {result.seconds * 1000:>10.2f}"
+        if traced and result.peak_memory is not None:
+            line += (
+                f" {result.peak_memory / 1024:>11.1f} {result.peak_rss / 2**20:>10.1f}"
+            )
+        elif traced:
+            line += f" {'':>11} {'':>10}"
+        lines.append(f"{line}  {answer}" + ("  (cached)" if result.cached else ""))
+        lines.extend(
+            f"{'':>20}  {name} = {value}"
+            for name, value in (result.counters or {}).items()
+        )
+    return "\n".join(lines)
+
+
+def as_records(results: list[Result]) -> list[dict[str, Any]]:
+    return [asdict(result) for result in results]
+
+
+def default_jobs() -> int:
+    return os.cpu_count() or 1
+
+
+def test_parse_days():
+    assert parse_days("1-3") == [1, 2, 3]
+    assert parse_days("7") == [7]
+    assert parse_days("1,3,5-7,3") == [1, 3, 5, 6, 7]
+
+
+def test_discover_days():
+    days = discover_days()
+    assert days[0] == 1
+    assert days == sorted(set(days))
+
+
+def test_run_day():
+    results = run_day(2, "data/day02_test.txt")
+    assert [(r.part, r.answer) for r in results] == [(0, None), (1, 8), (2, 2286)]
+
+
+def test_run_missing_input():
+    (result,) = run_day(2, "data/no_such_file.txt")
+    assert result.part == 0 and "FileNotFoundError" in result.error
+
+
+def test_run_pool():
+    results = run([2, 4], jobs=2, inputs="data/day{day:02d}_test.txt")
+    assert [(r.day, r.part, r.answer) for r in results if r.part] == [
+        (2, 1, 8),
+        (2, 2, 2286),
+        (4, 1, 13),
+        (4, 2, 30),
+    ]
+
+
+def test_solve_many(tmp_path):
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_bytes(Path("data/day09_test.txt").read_bytes())
+    paths = input_paths([str(tmp_path), "data/no_such_file.txt"])
+    assert [Path(path).name for path in paths] == ["a.txt", "b.txt", "no_such_file.txt"]
+    for backend in ("serial", "process"):
+        solved = list(solve_many(9, paths, jobs=2, backend=backend))
+        assert [path for path, _ in solved] == paths
+        assert [r.answer for r in solved[0][1]] == [None, 114, 2]
+        assert solved[2][1][0].error
+
+
+def test_run_backends():
+    inputs = "data/day{day:02d}_test.txt"
+    expected = [(r.day, r.part, r.answer) for r in run([5, 16], inputs=inputs)]
+    for backend in parallel.available_backends():
+        for days in ([5, 16], [16]):
+            results = run(days, jobs=2, inputs=inputs, backend=backend)
+            assert [(r.day, r.part, r.answer) for r in results] == [
+                answer for answer in expected if answer[0] in days
+            ]
+    assert parallel.backend == "serial"
+
+
+def test_run_day_answer_cache(tmp_path):
+    first = run_day(2, "data/day02_test.txt", answer_cache=tmp_path)
+    second = run_day(2, "data/day02_test.txt", answer_cache=tmp_path)
+    forced = run_day(2, "data/day02_test.txt", answer_cache=tmp_path, force=True)
+    assert [r.answer for r in second] == [r.answer for r in first] == [None, 8, 2286]
+    assert [r.seconds for r in second] == [r.seconds for r in first]
+    assert [r.cached for r in (first[1], second[1], forced[1])] == [False, True, False]
+    (missing,) = run_day(2, "data/no_such_file.txt", answer_cache=tmp_path)
+    assert "FileNotFoundError" in missing.error
+
+
+def test_run_day_memory():
+    results = run_day(16, "data/day16_test.txt", trace_memory=True)
+    assert [r.answer for r in results] == [None, 46, 51]
+    assert all(r.peak_memory > 0 and r.peak_rss > r.peak_memory for r in results)
+    assert "Peak (KiB)" in format_table(results)
+    assert run_day(16, "data/day16_test.txt")[1].peak_memory is None
+
+
+def test_run_day_counters():
+    results = run_day(17, "data/day17_test.txt", count=True)
+    assert results[1].answer == 102
+    assert results[1].counters["search.pops"] >= results[1].counters["search.settled"]
+    assert run_day(17, "data/day17_test.txt")[1].counters is None
+
+
+def test_run_counters_backend():
+    # Day 12 maps over the records with parallel.pmap, and counts the hits of
+    # a cache of this process, emptied so that both runs start alike.
+    inputs = "data/day{day:02d}_test.txt"
+    load_day(12).count_possible.cache_clear()
+    serial = run([12], inputs=inputs, count=True, backend="serial")
+    load_day(12).count_possible.cache_clear()
+    pooled = run([12], jobs=2, inputs=inputs, count=True, backend="process")
+    assert pooled[2].counters == serial[2].counters and serial[2].counters
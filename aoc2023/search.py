@@ -0,0 +1,158 @@
+"""
+    Advent of Code 2023
+    Search: shortest paths over integer states, with three kinds of queue.
+
+    States are the integers 0 .. size - 1 (a day encodes its own, say a flat
+    grid index and a direction in the low bit), so distances live in an array
+    rather than in a dict of tuples. expand(state) returns the (next state,
+    weight) pairs leaving a state as one list, which is where a day expresses
+    its moving rules.
+
+    dijkstra uses a binary heap. dial uses a ring of buckets, one per cost
+    modulo the largest weight plus one: with small integer weights, pushing
+    and popping are O(1). astar is dijkstra ordered by cost plus a consistent
+    heuristic (one that never overestimates, even from state to state).
+
+    Each returns (distances, target): target is the first state of targets
+    settled, or -1 when the search ran out of states. Only settled states have
+    their final distance, once a target is found the others may be larger.
+"""
+
+import heapq
+from array import array
+from collections.abc import Callable, Container, Iterable
+
+from aoc2023 import counters
+
+UNREACHED = 2**62
+Expand = Callable[[int], list[tuple[int, int]]]
+
+
+def new_distances(size: int, sources: Iterable[int]) -> array:
+    distances = array("q", [UNREACHED]) * size
+    for source in sources:
+        distances[source] = 0
+    return distances
+
+
+def report(pushes: int, pops: int, settled: bytearray) -> None:
+    if not counters.enabled:
+        return
+    counters.add("search.pushes", pushes)
+    counters.add("search.pops", pops)
+    counters.add("search.settled", settled.count(1))
+
+
+def dijkstra(
+    size: int, sources: Iterable[int], expand: Expand, targets: Container[int] = ()
+) -> tuple[array, int]:
+    sources = list(sources)
+    distances = new_distances(size, sources)
+    settled = bytearray(size)
+    todo = [(0, source) for source in sources]
+    heapq.heapify(todo)
+    pushes, pops, target = len(todo), 0, -1
+    while todo:
+        cost, state = heapq.heappop(todo)
+        pops += 1
+        if settled[state]:
+            continue
+        settled[state] = 1
+        if state in targets:
+            target = state
+            break
+        for following, weight in expand(state):
+            if cost + weight < distances[following]:
+                distances[following] = cost + weight
+                heapq.heappush(todo, (cost + weight, following))
+                pushes += 1
+    report(pushes, pops, settled)
+    return distances, target
+
+
+def dial(
+    size: int,
+    sources: Iterable[int],
+    expand: Expand,
+    targets: Container[int] = (),
+    max_weight: int = 9,
+) -> tuple[array, int]:
+    """Weights must be integers between 0 and max_weight."""
+    sources = list(sources)
+    distances = new_distances(size, sources)
+    settled = bytearray(size)
+    # Pending costs are all within max_weight of the cost being settled, so
+    # max_weight + 1 buckets, reused round and round, are enough.
+    buckets = [[] for _ in range(max_weight + 1)]
+    buckets[0].extend(sources)
+    pending = pushes = len(sources)
+    pops, cost, target = 0, 0, -1
+    while pending and target == -1:
+        bucket = buckets[cost % len(buckets)]
+        while bucket:
+            state = bucket.pop()
+            pending -= 1
+            pops += 1
+            if settled[state] or distances[state] != cost:
+                continue  # settled already, or pushed again with a lower cost
+            settled[state] = 1
+            if state in targets:
+                target = state
+                break
+            for following, weight in expand(state):
+                if cost + weight < distances[following]:
+                    distances[following] = cost + weight
+                    buckets[(cost + weight) % len(buckets)].append(following)
+                    pending += 1
+                    pushes += 1
+        cost += 1
+    report(pushes, pops, settled)
+    return distances, target
+
+
+def astar(
+    size: int,
+    sources: Iterable[int],
+    expand: Expand,
+    targets: Container[int],
+    heuristic: Callable[[int], int],
+) -> tuple[array, int]:
+    sources = list(sources)
+    distances = new_distances(size, sources)
+    settled = bytearray(size)
+    todo = [(heuristic(source), source) for source in sources]
+    heapq.heapify(todo)
+    pushes, pops, target = len(todo), 0, -1
+    while todo:
+        _, state = heapq.heappop(todo)
+        pops += 1
+        if settled[state]:
+            continue
+        settled[state] = 1
+        if state in targets:
+            target = state
+            break
+        cost = distances[state]
+        for following, weight in expand(state):
+            if cost + weight < distances[following]:
+                distances[following] = cost + weight
+                heapq.heappush(todo, (cost + weight + heuristic(following), following))
+                pushes += 1
+    report(pushes, pops, settled)
+    return distances, target
+
+
+def test_searches():
+    # A ring of 10 states, one step forward costs 1 and a jump of 5 costs 3.
+    def expand(state):
+        return [((state + 1) % 10, 1), ((state + 5) % 10, 3)]
+
+    expected = [0, 1, 2, 3, 4, 3, 4, 5, 6, 7]
+    assert list(dijkstra(10, [0], expand)[0]) == expected
+    assert list(dial(10, [0], expand, max_weight=3)[0]) == expected
+    distances, target = astar(10, [0], expand, {8}, heuristic=lambda _: 0)
+    assert (target, distances[8]) == (8, 6)
+    for search in (dijkstra, dial):
+        distances, target = search(10, [0], expand, targets={8})
+        assert (target, distances[8]) == (8, 6)
+    assert dijkstra(10, [0], lambda _: [], targets={8})[1] == -1
@@ -0,0 +1,166 @@
+"""
+    Advent of Code 2023
+    Solver daemon: keep every day imported and recent inputs parsed, and answer
+    solve requests over a Unix domain socket.
+
+    The protocol is one JSON object per line each way. A request is
+    {"day": 17, "part": 1, "input": "data/day17.txt"}, the reply carries the
+    answer and the time spent, or an error. Parsed inputs are kept in a bounded
+    LRU keyed by the input path, size and modification time, so an edited input
+    is parsed again and memory stays capped.
+"""
+
+import json
+import os
+import socketserver
+import time
+from collections import OrderedDict
+from typing import Any
+
+from aoc2023 import runner
+from aoc2023.client import DEFAULT_SOCKET, Client
+
+DEFAULT_MAX_INPUTS = 16
+
+
+class ParsedInputs:
+    """LRU of parse_input results, at most max_size of them."""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_INPUTS):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def key(day: int, input_path: str) -> tuple:
+        stat = os.stat(input_path)
+        return (day, os.path.realpath(input_path), stat.st_size, stat.st_mtime_ns)
+
+    def get(self, day: int, module, input_path: str) -> tuple[Any, bool]:
+        """The parsed input and whether it was already resident."""
+        key = self.key(day, input_path)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key], True
+        self.misses += 1
+        data = module.parse_input(input_path)
+        self.entries[key] = data
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return data, False
+
+
+class Solver:
+    def __init__(self, max_inputs: int = DEFAULT_MAX_INPUTS):
+        self.modules = {day: runner.load_day(day) for day in runner.discover_days()}
+        self.inputs = ParsedInputs(max_inputs)
+
+    def solve(self, day: int, part: int, input_path: str) -> dict[str, Any]:
+        module = self.modules[day]
+        start = time.perf_counter()
+        data, cached = self.inputs.get(day, module, input_path)
+        parse_seconds = time.perf_counter() - start
+        answer, seconds = runner.timed(runner.part_function(module, day, part), data)
+        return {
+            "day": day,
+            "part": part,
+            "answer": answer,
+            "seconds": seconds,
+            "parse_seconds": parse_seconds,
+            "cached": cached,
+        }
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "days": sorted(self.modules),
+            "inputs": len(self.inputs.entries),
+            "max_inputs": self.inputs.max_size,
+            "hits": self.inputs.hits,
+            "misses": self.inputs.misses,
+        }
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        try:
+            if request.get("op") == "stats":
+                return self.stats()
+            return self.solve(
+                int(request["day"]), int(request["part"]), request["input"]
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            return {"error": repr(exc)}
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            request = json.loads(line)
+            if request.get("op") == "shutdown":
+                self.wfile.write(b'{"shutdown": true}\n')
+                # Checked by SolverServer.serve once this connection is done.
+                self.server.shutdown_requested = True
+                return
+            reply = self.server.solver.handle(request)
+            self.wfile.write(json.dumps(reply, default=str).encode() + b"\n")
+
+
+class SolverServer(socketserver.UnixStreamServer):
+    # One request at a time: solutions share module state such as the counters.
+
+    def __init__(self, socket_path: str, solver: Solver):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        os.makedirs(os.path.dirname(socket_path) or ".", exist_ok=True)
+        self.solver = solver
+        self.shutdown_requested = False
+        super().__init__(socket_path, RequestHandler)
+
+    def serve(self) -> None:
+        try:
+            while not self.shutdown_requested:
+                self.handle_request()
+        finally:
+            self.server_close()
+            os.unlink(self.server_address)
+
+
+def serve(socket_path: str = DEFAULT_SOCKET, max_inputs: int = DEFAULT_MAX_INPUTS):
+    SolverServer(socket_path, Solver(max_inputs)).serve()
+
+
+def test_parsed_inputs_lru(tmp_path):
+    class Module:
+        parse_input = staticmethod(lambda path: path)
+
+    paths = []
+    for name in "abc":
+        paths.append(tmp_path / name)
+        paths[-1].write_text(name)
+    inputs = ParsedInputs(max_size=2)
+    assert inputs.get(1, Module, paths[0]) == (paths[0], False)
+    assert inputs.get(1, Module, paths[0]) == (paths[0], True)
+    inputs.get(1, Module, paths[1])
+    inputs.get(1, Module, paths[2])
+    assert len(inputs.entries) == 2
+    assert inputs.get(1, Module, paths[0])[1] is False
+    paths[0].write_text("edited")
+    assert inputs.get(1, Module, paths[0])[1] is False
+
+
+def test_server(tmp_path):
+    import threading  # pylint: disable=import-outside-toplevel
+
+    socket_path = str(tmp_path / "solver.sock")
+    server = SolverServer(socket_path, Solver())
+    thread = threading.Thread(target=server.serve)
+    thread.start()
+    with Client(socket_path) as client:
+        first = client.solve(2, 1, "data/day02_test.txt")
+        second = client.solve(2, 2, "data/day02_test.txt")
+        assert (first["answer"], first["cached"]) == (8, False)
+        assert (second["answer"], second["cached"]) == (2286, True)
+        assert "FileNotFoundError" in client.solve(2, 1, "data/nothing.txt")["error"]
+        assert client.request({"op": "stats"})["inputs"] == 1
+        client.request({"op": "shutdown"})
+    thread.join(timeout=5)
+    assert not thread.is_alive() and not os.path.exists(socket_path)
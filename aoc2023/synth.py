@@ -0,0 +1,606 @@
+"""
+    Advent of Code 2023
+    Synthetic inputs: seeded generators of valid puzzle inputs at any scale.
+
+    A scale of 1 gives an input of roughly the size of a real puzzle input,
+    a scale of 10 an input about ten times bigger (grids grow with the square
+    root of the scale, so that the number of cells grows linearly).
+"""
+
+import random
+import string
+from collections.abc import Callable
+from itertools import pairwise
+from math import isqrt, sqrt
+from pathlib import Path
+
+from aoc2023 import runner
+
+Cell = tuple[int, int]
+Generator = Callable[[random.Random, float], str]
+
+DIGIT_WORDS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+
+def count(base: int, scale: float) -> int:
+    return max(1, round(base * scale))
+
+
+def side(base: int, scale: float) -> int:
+    return max(3, round(base * sqrt(scale)))
+
+
+def grid_text(rows: list[list[str]]) -> str:
+    return "".join("".join(row) + "\n" for row in rows)
+
+
+def random_grid(
+    rng: random.Random, height: int, width: int, symbols: str, weights: list[float]
+) -> list[list[str]]:
+    return [rng.choices(symbols, weights, k=width) for _ in range(height)]
+
+
+def unique_names(
+    rng: random.Random, num: int, length: int, alphabet: str, reject=lambda _: False
+) -> list[str]:
+    names: set[str] = set()
+    while len(names) < num:
+        name = "".join(rng.choices(alphabet, k=length))
+        if not reject(name):
+            names.add(name)
+    return sorted(names)
+
+
+def polyomino(rng: random.Random, rows: int, cols: int, fill: float) -> set[Cell]:
+    """A random spanning tree drawn as a set of cells: nodes on even rows and
+    columns, plus the cells between linked nodes. Being a tree, the shape has
+    no holes, and no two cells touch only at a corner, so its boundary is a
+    simple (and long, winding) closed curve."""
+    nodes = ((rows + 1) // 2, (cols + 1) // 2)
+    root = (nodes[0] // 2, nodes[1] // 2)
+    visited = {root}
+    cells = {(2 * root[0], 2 * root[1])}
+    frontier = [(root, node) for node in neighbours4(root, *nodes)]
+    while frontier and len(visited) < fill * nodes[0] * nodes[1]:
+        idx = rng.randrange(len(frontier))
+        frontier[idx], frontier[-1] = frontier[-1], frontier[idx]
+        (i, j), node = frontier.pop()
+        if node in visited:
+            continue
+        visited.add(node)
+        cells.update([(2 * node[0], 2 * node[1]), (i + node[0], j + node[1])])
+        frontier.extend((node, other) for other in neighbours4(node, *nodes))
+    return cells
+
+
+def neighbours4(cell: Cell, rows: int, cols: int):
+    i, j = cell
+    for ni, nj in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+        if 0 <= ni < rows and 0 <= nj < cols:
+            yield ni, nj
+
+
+def boundary(cells: set[Cell]) -> list[Cell]:
+    """Lattice vertices of the boundary of a polyomino, in walking order."""
+    adjacency: dict[Cell, list[Cell]] = {}
+
+    def add_edge(a, b):
+        adjacency.setdefault(a, []).append(b)
+        adjacency.setdefault(b, []).append(a)
+
+    for i, j in cells:
+        if (i - 1, j) not in cells:
+            add_edge((i, j), (i, j + 1))
+        if (i + 1, j) not in cells:
+            add_edge((i + 1, j), (i + 1, j + 1))
+        if (i, j - 1) not in cells:
+            add_edge((i, j), (i + 1, j))
+        if (i, j + 1) not in cells:
+            add_edge((i, j + 1), (i + 1, j + 1))
+
+    start = min(adjacency)
+    loop = [start]
+    previous, current = start, adjacency[start][0]
+    while current != start:
+        loop.append(current)
+        a, b = adjacency[current]
+        previous, current = current, (b if a == previous else a)
+    return loop
+
+
+def corners(loop: list[Cell]) -> list[Cell]:
+    """Drop the vertices in the middle of straight runs."""
+    return [
+        vertex
+        for prev, vertex, nxt in zip(loop[-1:] + loop[:-1], loop, loop[1:] + loop[:1])
+        if (prev[0] == vertex[0]) != (vertex[0] == nxt[0])
+    ]
+
+
+def signed_area2(vertices: list[Cell]) -> int:
+    return sum(
+        xa * yb - ya * xb
+        for (xa, ya), (xb, yb) in zip(vertices, vertices[1:] + vertices[:1])
+    )
+
+
+def day01(rng: random.Random, scale: float) -> str:
+    def line():
+        tokens = []
+        for _ in range(rng.randint(4, 12)):
+            kind = rng.random()
+            if kind < 0.15:
+                tokens.append(rng.choice("123456789"))
+            elif kind < 0.4:
+                tokens.append(rng.choice(DIGIT_WORDS))
+            else:
+                tokens.append("".join(rng.choices(string.ascii_lowercase, k=3)))
+        tokens.insert(rng.randrange(len(tokens) + 1), rng.choice("123456789"))
+        return "".join(tokens)[: rng.randint(20, 45)]
+
+    lines = []
+    for _ in range(count(1000, scale)):
+        text = line()
+        if not any(c.isdigit() for c in text):
+            text += rng.choice("123456789")
+        lines.append(text)
+    return "".join(text + "\n" for text in lines)
+
+
+def day02(rng: random.Random, scale: float) -> str:
+    def draw():
+        colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+        return ", ".join(f"{rng.randint(1, 20)} {color}" for color in colors)
+
+    return "".join(
+        f"Game {game_id}: " + "; ".join(draw() for _ in range(rng.randint(1, 6))) + "\n"
+        for game_id in range(1, count(100, scale) + 1)
+    )
+
+
+def day03(rng: random.Random, scale: float) -> str:
+    size = side(140, scale)
+
+    def row():
+        cells = []
+        while len(cells) < size:
+            kind = rng.random()
+            digits = str(rng.randint(1, 999))
+            if kind < 0.12 and len(cells) + len(digits) < size:
+                cells.extend(digits)
+                cells.append("." if rng.random() < 0.8 else rng.choice("*#+$/=%@&-"))
+            elif kind < 0.17:
+                cells.append("*" if rng.random() < 0.4 else rng.choice("#+$/=%@&-"))
+            else:
+                cells.append(".")
+        return cells[:size]
+
+    return grid_text([row() for _ in range(size)])
+
+
+def day04(rng: random.Random, scale: float) -> str:
+    # Copies of a card are won only by cards that did not win copies themselves,
+    # so that part 2 does not grow exponentially with the number of cards.
+    lines = []
+    cooldown = 0
+    num_cards = count(200, scale)
+    for card_id in range(1, num_cards + 1):
+        matches = 0 if cooldown or rng.random() < 0.6 else rng.randint(1, 10)
+        cooldown = matches if matches else max(0, cooldown - 1)
+        winning = rng.sample(range(1, 100), 10)
+        others = [n for n in range(1, 100) if n not in winning]
+        have = rng.sample(winning, matches) + rng.sample(others, 25 - matches)
+        rng.shuffle(have)
+        lines.append(
+            f"Card {card_id:>{len(str(num_cards))}}: "
+            + " ".join(f"{n:>2}" for n in winning)
+            + " | "
+            + " ".join(f"{n:>2}" for n in have)
+        )
+    return "".join(line + "\n" for line in lines)
+
+
+def day05(rng: random.Random, scale: float) -> str:
+    limit = 1 << 32
+    names = [
+        "seed",
+        "soil",
+        "fertilizer",
+        "water",
+        "light",
+        "temperature",
+        "humidity",
+        "location",
+    ]
+    num_seeds = 2 * count(10, scale)
+    seeds = []
+    for _ in range(num_seeds // 2):
+        start = rng.randrange(limit // 2)
+        seeds.extend([start, rng.randint(1, limit // (4 * num_seeds))])
+
+    sections = []
+    for source, dest in pairwise(names):
+        cuts = sorted(rng.sample(range(1, limit), 2 * count(30, scale)))
+        rules = []
+        for start, end in zip(cuts[::2], cuts[1::2]):
+            size = end - start
+            rules.append(f"{rng.randrange(limit - size)} {start} {size}")
+        rng.shuffle(rules)
+        sections.append(f"{source}-to-{dest} map:\n" + "\n".join(rules))
+
+    # No trailing newline: day 5 splits the last section on "\n".
+    return "seeds: " + " ".join(map(str, seeds)) + "\n\n" + "\n\n".join(sections)
+
+
+def day06(rng: random.Random, scale: float) -> str:
+    # Day 6 has a closed form solution and part 2 concatenates all the races
+    # into a single number, so the input keeps the puzzle size at any scale.
+    del scale
+    times = [rng.randint(40, 99) for _ in range(4)]
+    distances = [rng.randint(time * time // 8, time * time // 4 - 1) for time in times]
+    return (
+        "Time:      " + "  ".join(f"{t:>4}" for t in times) + "\n"
+        "Distance:  " + "  ".join(f"{d:>4}" for d in distances) + "\n"
+    )
+
+
+def day07(rng: random.Random, scale: float) -> str:
+    return "".join(
+        "".join(rng.choices("23456789TJQKA", k=5)) + f" {rng.randint(1, 1000)}\n"
+        for _ in range(count(1000, scale))
+    )
+
+
+def day08(rng: random.Random, scale: float) -> str:
+    # Each ghost walks a ring of positions with two nodes each (the direction
+    # decides which one), so the first exit is also the period of the walk.
+    directions = "".join(rng.choices("LR", k=rng.randint(200, 300)))
+    ring_sizes = rng.sample([p for p in range(30, 200) if is_prime(p)], 6)
+    ring_sizes = [max(2, round(size * sqrt(scale))) for size in ring_sizes]
+    alphabet = string.ascii_uppercase + string.digits
+    needed = sum(2 * size for size in ring_sizes)
+    if needed > 30_000:
+        raise ValueError("day 8 inputs are limited by the 3 character node names")
+    names = unique_names(
+        rng,
+        needed,
+        3,
+        alphabet,
+        reject=lambda name: name[-1] in "AZ",
+    )
+    rng.shuffle(names)
+
+    prefixes = unique_names(rng, len(ring_sizes) - 1, 2, alphabet)
+    nodes = {}
+    for ghost, size in enumerate(ring_sizes):
+        start, exit_ = (
+            ("AAA", "ZZZ")
+            if ghost == 0
+            else (
+                prefixes[ghost - 1] + "A",
+                prefixes[ghost - 1] + "Z",
+            )
+        )
+        positions = [(names.pop(), names.pop()) for _ in range(size - 1)]
+        positions.append((exit_, exit_))
+        nodes[start] = positions[0]
+        for (a, b), following in zip(positions, positions[1:] + positions[:1]):
+            nodes[a] = nodes[b] = following
+    lines = [f"{name} = ({left}, {right})" for name, (left, right) in nodes.items()]
+    rng.shuffle(lines)
+    return directions + "\n\n" + "".join(line + "\n" for line in lines)
+
+
+def is_prime(n: int) -> bool:
+    return n > 1 and all(n % d for d in range(2, isqrt(n) + 1))
+
+
+def day09(rng: random.Random, scale: float) -> str:
+    def sequence():
+        coefficients = [rng.randint(-3, 3) for _ in range(rng.randint(1, 7))]
+        return [
+            sum(coef * x**power for power, coef in enumerate(coefficients))
+            for x in range(21)
+        ]
+
+    return "".join(
+        " ".join(map(str, sequence())) + "\n" for _ in range(count(200, scale))
+    )
+
+
+PIPES = {
+    frozenset("NS"): "|",
+    frozenset("EW"): "-",
+    frozenset("NE"): "L",
+    frozenset("NW"): "J",
+    frozenset("SW"): "7",
+    frozenset("SE"): "F",
+}
+
+
+def day10(rng: random.Random, scale: float) -> str:
+    size = side(140, scale)
+    cells = polyomino(rng, (size - 1) // 2, (size - 1) // 2, fill=0.8)
+    vertices = boundary(cells)
+
+    # Lattice vertices and the edges between them become the tiles of the loop.
+    loop = []
+    for (ra, ca), (rb, cb) in zip(vertices, vertices[1:] + vertices[:1]):
+        loop.extend([(2 * ra, 2 * ca), (ra + rb, ca + cb)])
+
+    def heading(a, b):
+        return {(-1, 0): "N", (1, 0): "S", (0, -1): "W", (0, 1): "E"}[
+            (b[0] - a[0], b[1] - a[1])
+        ]
+
+    grid = random_grid(rng, size, size, "|-LJ7F.", [1, 1, 1, 1, 1, 1, 6])
+    for prev, tile, nxt in zip(loop[-1:] + loop[:-1], loop, loop[1:] + loop[:1]):
+        grid[tile[0]][tile[1]] = PIPES[
+            frozenset(heading(tile, prev) + heading(tile, nxt))
+        ]
+
+    start = rng.choice(loop)
+    on_loop = set(loop)
+    for r, c in neighbours4(start, size, size):
+        if (r, c) not in on_loop:
+            grid[r][c] = "."
+    grid[start[0]][start[1]] = "S"
+    return grid_text(grid)
+
+
+def day11(rng: random.Random, scale: float) -> str:
+    size = side(140, scale)
+    empty_rows = set(rng.sample(range(size), max(1, size // 20)))
+    empty_cols = set(rng.sample(range(size), max(1, size // 20)))
+    grid = [
+        [
+            "#"
+            if i not in empty_rows and j not in empty_cols and rng.random() < 0.025
+            else "."
+            for j in range(size)
+        ]
+        for i in range(size)
+    ]
+    grid[min(set(range(size)) - empty_rows)][min(set(range(size)) - empty_cols)] = "#"
+    return grid_text(grid)
+
+
+def day12(rng: random.Random, scale: float) -> str:
+    def record():
+        length = rng.randint(round(6 * sqrt(scale)), round(20 * sqrt(scale)))
+        springs = rng.choices("#.", [2, 3], k=length)
+        springs[rng.randrange(length)] = "#"
+        sizes = [len(group) for group in "".join(springs).split(".") if group]
+        masked = "".join(s if rng.random() < 0.6 else "?" for s in springs)
+        return masked + " " + ",".join(map(str, sizes))
+
+    return "".join(record() + "\n" for _ in range(side(1000, scale)))
+
+
+def day13(rng: random.Random, scale: float) -> str:
+    # Columns mirror exactly around one line, rows mirror around another one
+    # but for a single smudge, placed in a column outside the mirrored range.
+    def pattern():
+        height, width = rng.randint(5, 17), rng.randint(5, 17)
+        grid = random_grid(rng, height, width, "#.", [1, 1])
+        row_line = rng.randint(1, height - 1)
+        col_line = rng.choice([c for c in range(1, width) if 2 * c != width])
+        for k in range(min(row_line, height - row_line)):
+            grid[row_line + k] = list(grid[row_line - 1 - k])
+        for row in grid:
+            for k in range(min(col_line, width - col_line)):
+                row[col_line + k] = row[col_line - 1 - k]
+        reach = min(col_line, width - col_line)
+        smudge_col = rng.choice(
+            [c for c in range(width) if not col_line - reach <= c < col_line + reach]
+        )
+        reach = min(row_line, height - row_line)
+        smudge_row = rng.randrange(row_line - reach, row_line + reach)
+        grid[smudge_row][smudge_col] = (
+            "#" if grid[smudge_row][smudge_col] == "." else "."
+        )
+        if rng.random() < 0.5:
+            grid = [list(col) for col in zip(*grid)]
+        return grid_text(grid)
+
+    return "\n".join(pattern() for _ in range(count(100, scale)))
+
+
+def day14(rng: random.Random, scale: float) -> str:
+    size = side(100, scale)
+    return grid_text(random_grid(rng, size, size, "O#.", [4, 3, 13]))
+
+
+def day15(rng: random.Random, scale: float) -> str:
+    labels = unique_names(rng, 500, 2, string.ascii_lowercase) + unique_names(
+        rng, 500, 4, string.ascii_lowercase
+    )
+    steps = [
+        label + "-" if rng.random() < 0.3 else f"{label}={rng.randint(1, 9)}"
+        for label in rng.choices(labels, k=count(4000, scale))
+    ]
+    # No trailing newline: day 15 splits the whole file on ",".
+    return ",".join(steps)
+
+
+def day16(rng: random.Random, scale: float) -> str:
+    size = side(110, scale)
+    return grid_text(random_grid(rng, size, size, ".|-/\\", [36, 1, 1, 1, 1]))
+
+
+def day17(rng: random.Random, scale: float) -> str:
+    size = side(141, scale)
+    return grid_text(random_grid(rng, size, size, "123456789", [1] * 9))
+
+
+def day18(rng: random.Random, scale: float) -> str:
+    # Both dig plans stretch the rows and columns of the same polyomino,
+    # which keeps the two polygons closed and simple with the same turns.
+    size = side(24, scale)
+    loop = corners(boundary(polyomino(rng, size, size, fill=0.8)))
+    if signed_area2([(c, r) for r, c in loop]) < 0:
+        # day 18 expects the plan to go around clockwise (y grows downwards)
+        loop.reverse()
+
+    def stretch(max_width):
+        xs = [0]
+        ys = [0]
+        for _ in range(size):
+            xs.append(xs[-1] + rng.randint(1, max_width))
+            ys.append(ys[-1] + rng.randint(1, max_width))
+        return [(xs[c], ys[r]) for r, c in loop]
+
+    plan1 = stretch(10)
+    plan2 = stretch(0xFFFFF // (size + 1))
+
+    def moves(vertices):
+        for (xa, ya), (xb, yb) in zip(vertices, vertices[1:] + vertices[:1]):
+            if xa == xb:
+                yield ("D" if yb > ya else "U"), abs(yb - ya)
+            else:
+                yield ("R" if xb > xa else "L"), abs(xb - xa)
+
+    return "".join(
+        f"{direction} {steps} (#{steps2:05x}{'RDLU'.index(direction2)})\n"
+        for (direction, steps), (direction2, steps2) in zip(moves(plan1), moves(plan2))
+    )
+
+
+def day19(rng: random.Random, scale: float) -> str:
+    num_workflows = count(550, scale)
+    names = unique_names(
+        rng,
+        num_workflows,
+        max(2, len(str(num_workflows))),
+        string.ascii_lowercase,
+        reject=lambda name: name == "in",
+    )
+    rng.shuffle(names)
+    # Every workflow knows the ratings that can reach it, and its conditions
+    # split them in two non empty ranges, like in the real puzzle inputs.
+    todo = [("in", {key: (1, 4000) for key in "xmas"})]
+    lines = []
+
+    def target(ranges):
+        if names and rng.random() < 0.6:
+            todo.append((names.pop(), ranges))
+            return todo[-1][0]
+        return rng.choice("AR")
+
+    while todo:
+        name, ranges = todo.pop(rng.randrange(len(todo)))
+        rules = []
+        for _ in range(rng.randint(1, 3)):
+            keys = [key for key, (low, high) in ranges.items() if low < high]
+            if not keys:
+                break
+            key = rng.choice(keys)
+            low, high = ranges[key]
+            if rng.random() < 0.5:
+                val = rng.randint(low + 1, high)
+                taken, ranges = (low, val - 1), dict(ranges, **{key: (val, high)})
+                condition = f"{key}<{val}"
+            else:
+                val = rng.randint(low, high - 1)
+                taken, ranges = (val + 1, high), dict(ranges, **{key: (low, val)})
+                condition = f"{key}>{val}"
+            rules.append(f"{condition}:{target(dict(ranges, **{key: taken}))}")
+        lines.append(name + "{" + ",".join(rules + [target(ranges)]) + "}")
+    rng.shuffle(lines)
+
+    parts = [
+        "{" + ",".join(f"{key}={rng.randint(1, 4000)}" for key in "xmas") + "}"
+        for _ in range(count(200, scale))
+    ]
+    return (
+        "".join(line + "\n" for line in lines) + "\n" + "".join(p + "\n" for p in parts)
+    )
+
+
+def day20(rng: random.Random, scale: float) -> str:
+    # The usual shape: 12 bit counters made of flip-flops, each one feeding a
+    # conjunction, which reports through an inverter to the conjunction before rx.
+    num_counters = count(4, scale)
+    names = unique_names(
+        rng,
+        14 * num_counters + 1,
+        max(2, len(str(num_counters)) + 1),
+        string.ascii_lowercase,
+        reject=lambda name: name == "rx",
+    )
+    rng.shuffle(names)
+    final = names.pop()
+    modules = {"broadcaster": ("", []), final: ("&", ["rx"])}
+    for _ in range(num_counters):
+        bits = rng.randrange(2048, 4096) | 1
+        flip_flops = [names.pop() for _ in range(12)]
+        conjunction, inverter = names.pop(), names.pop()
+        modules["broadcaster"][1].append(flip_flops[0])
+        modules[conjunction] = ("&", [flip_flops[0], inverter])
+        modules[inverter] = ("&", [final])
+        for i, flip_flop in enumerate(flip_flops):
+            destinations = flip_flops[i + 1 : i + 2]
+            if bits >> i & 1:
+                destinations.append(conjunction)
+            else:
+                modules[conjunction][1].append(flip_flop)
+            modules[flip_flop] = ("%", destinations)
+    lines = [
+        f"{kind}{name} -> {', '.join(dests)}" for name, (kind, dests) in modules.items()
+    ]
+    rng.shuffle(lines)
+    return "".join(line + "\n" for line in lines)
+
+
+GENERATORS: dict[int, Generator] = {
+    1: day01,
+    2: day02,
+    3: day03,
+    4: day04,
+    5: day05,
+    6: day06,
+    7: day07,
+    8: day08,
+    9: day09,
+    10: day10,
+    11: day11,
+    12: day12,
+    13: day13,
+    14: day14,
+    15: day15,
+    16: day16,
+    17: day17,
+    18: day18,
+    19: day19,
+    20: day20,
+}
+
+
+def generate(day: int, scale: float = 1, seed: int = 0) -> str:
+    return GENERATORS[day](random.Random(f"{day}:{seed}"), scale)
+
+
+def write_input(day: int, path: str | Path, scale: float = 1, seed: int = 0) -> Path:
+    path = Path(path)
+    path.write_text(generate(day, scale, seed), encoding="ascii")
+    return path
+
+
+def test_generate_is_reproducible():
+    for day in GENERATORS:
+        assert generate(day, 0.05, seed=1) == generate(day, 0.05, seed=1)
+        assert generate(day, 0.05, seed=1) != generate(day, 0.05, seed=2)
+
+
+def test_generated_inputs_are_solvable(tmp_path):
+    for day in range(1, 20):
+        path = write_input(day, tmp_path / f"day{day:02d}.txt", scale=0.05, seed=1)
+        results = runner.run_day(day, str(path))
+        assert [r.error for r in results] == [None, None, None], day
+        assert all(isinstance(r.answer, int) for r in results if r.part), day
+
+
+def test_polyomino_boundary_is_simple():
+    vertices = boundary(polyomino(random.Random(3), 30, 30, fill=0.8))
+    assert len(vertices) == len(set(vertices))
+    assert all(abs(a - c) + abs(b - d) == 1 for (a, b), (c, d) in pairwise(vertices))
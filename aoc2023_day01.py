@@ -3,50 +3,129 @@
     Day 01: Trebuchet?!
 """
 
-import re
-import pytest
-
-LETTERS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
-DIGITS = ["1", "2", "3", "4", "5", "6", "7", "8", "9"]
-LETTERS_TO_DIGITS = dict(zip(LETTERS, DIGITS))
-RE_LEFT = re.compile(r"\d|" + "|".join(LETTERS))
-RE_RIGHT = re.compile(r"\d|" + "|".join(s[::-1] for s in LETTERS))
-
-
-def parse_input(file_name: str) -> list[str]:
-    with open(file_name, "r", encoding="ascii") as data_file:
-        return data_file.read().splitlines()
-
-
-def day01_part1(data: list[str]) -> int:
-    def get_first_digit(line: str, reverse: bool = False) -> str:
-        return next(
-            (c for c in (reversed(line) if reverse else line) if c.isdigit()), "0"
-        )
-
-    return sum(
-        int(get_first_digit(line) + get_first_digit(line, reverse=True))
-        for line in data
-    )
-
-
-def day01_part2(data: list[str]) -> int:
-    def get_first_digit(line: str, reverse: bool = False) -> str:
-        pattern = RE_RIGHT if reverse else RE_LEFT
-        if match_obj := pattern.search(line[::-1] if reverse else line):
-            m = match_obj[0]
-            return m if m.isdigit() else LETTERS_TO_DIGITS[m[::-1] if reverse else m]
-        return "0"
-
-    return sum(
-        int(get_first_digit(line) + get_first_digit(line, reverse=True))
-        for line in data
-    )
-
-
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return [parse_input("data/day01_test1.txt"), parse_input("data/day01_test2.txt")]
+from collections import deque
+
+from aoc2023.cache import cached_parse
+
+LETTERS = b"one two three four five six seven eight nine".split()
+DIGITS = {bytes([ord("0") + digit]): digit for digit in range(10)}
+WORDS = DIGITS | {word: digit for digit, word in enumerate(LETTERS, 1)}
+NEWLINE = ord("\n")
+
+# Automaton over bytes: the state is an offset, 256 times the node in the trie
+# of the patterns, and delta[state + byte] is the next state. output[state] is
+# 1 + the digit of the pattern ending there, 0 if none does, and -1 on the
+# newline state, whose transitions are those of the root.
+Automaton = tuple[list[int], list[int]]
+
+
+def build_automaton(patterns: dict[bytes, int]) -> Automaton:
+    """Aho-Corasick automaton finding every occurrence of patterns in one pass,
+    its failure links resolved into a full transition table."""
+    trie, output = [{}], [0]
+    for pattern, digit in patterns.items():
+        node = 0
+        for byte in pattern:
+            if byte not in trie[node]:
+                trie[node][byte] = len(trie)
+                trie.append({})
+                output.append(0)
+            node = trie[node][byte]
+        output[node] = digit + 1  # no pattern is the suffix of another
+
+    # Breadth first, the failure of a node (its longest proper suffix in the
+    # trie) has its transitions resolved before the node itself.
+    delta = [0] * (256 * (len(trie) + 1))
+    failure = [0] * len(trie)
+    todo = deque([0])
+    while todo:
+        node = todo.popleft()
+        for byte in range(256):
+            child = trie[node].get(byte)
+            if child is None:
+                delta[256 * node + byte] = delta[256 * failure[node] + byte]
+                continue
+            delta[256 * node + byte] = 256 * child
+            failure[child] = delta[256 * failure[node] + byte] // 256 if node else 0
+            if not output[child]:
+                output[child] = output[failure[child]]
+            todo.append(child)
+
+    newline = 256 * len(trie)
+    delta[newline : newline + 256] = delta[:256]
+    for state in range(0, newline + 256, 256):
+        delta[state + NEWLINE] = newline
+    return delta, [value for value in output for _ in range(256)] + [-1] * 256
+
+
+AUTOMATA = {}
+
+
+def automaton(words: bool) -> Automaton:
+    # Built on first use rather than at import, they take a few milliseconds.
+    if words not in AUTOMATA:
+        AUTOMATA[words] = build_automaton(WORDS if words else DIGITS)
+    return AUTOMATA[words]
+
+
+def calibrate(buffer, scanner: Automaton) -> int:
+    """Sum of the calibration values of the lines of buffer, a bytes-like
+    object, read once from start to end."""
+    delta, output = scanner
+    total = state = first = last = 0
+    for byte in buffer:
+        state = delta[state + byte]
+        if found := output[state]:
+            if found < 0:
+                total += 10 * first + last - 11 if first else 0
+                first = 0
+            else:
+                last = found
+                first = first or found
+    return total + (10 * first + last - 11 if first else 0)
+
+
+def calibrate_digits(buffer) -> int:
+    """calibrate for the digits only, vectorized with NumPy over the whole
+    buffer: no Python loop over its lines, let alone its bytes."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    # Bytes below "0" wrap around to large values, one comparison is enough.
+    positions = np.flatnonzero(data - ord("0") < 10)
+    if not positions.size:
+        return 0
+    digits = data[positions] - ord("0")
+    # The line of each digit, and where each line's run of digits starts.
+    lines = np.searchsorted(np.flatnonzero(data == NEWLINE), positions)
+    starts = np.flatnonzero(np.diff(lines)) + 1
+    firsts = digits[np.concatenate(([0], starts))]
+    lasts = digits[np.concatenate((starts - 1, [digits.size - 1]))]
+    return int(10 * firsts.sum(dtype=np.int64) + lasts.sum(dtype=np.int64))
+
+
+# Below this size, importing NumPy takes longer than scanning the input.
+VECTORIZE_MIN_BYTES = 1 << 20
+
+
+@cached_parse
+def parse_input(file_name: str) -> bytes:
+    # The whole file as one buffer, which both parts scan from start to end.
+    with open(file_name, "rb") as data_file:
+        return data_file.read()
+
+
+def day01_part1(data: bytes) -> int:
+    if len(data) >= VECTORIZE_MIN_BYTES:
+        return calibrate_digits(data)
+    return calibrate(data, automaton(words=False))
+
+
+def day01_part2(data: bytes) -> int:
+    return calibrate(data, automaton(words=True))
+
+
+TEST_INPUT = ["data/day01_test1.txt", "data/day01_test2.txt"]
 
 
 def test_day01_part1(test_data):
@@ -57,6 +136,20 @@ def test_day01_part2(test_data):
     assert day01_part2(test_data[1]) == 281
 
 
+def test_calibrate():
+    scanner = automaton(words=True)
+    # Overlapping words, a line without digits, no final newline.
+    assert calibrate(b"twone\nxyz\n5eightwothree", scanner) == 21 + 0 + 53
+    assert calibrate(b"sevenine\n\noneight", automaton(words=False)) == 0
+    assert calibrate(b"", scanner) == 0 and calibrate(b"0a", scanner) == 0
+
+
+def test_calibrate_digits():
+    digits = automaton(words=False)
+    for text in (b"a1b2c3\nxyz\n\n7\n45", b"x9\n", b"none\n", b""):
+        assert calibrate_digits(text) == calibrate(text, digits)
+
+
 if __name__ == "__main__":
     input_data = parse_input("data/day01.txt")
 
@@ -3,62 +3,230 @@
     Day 02: Cube Conundrum
 """
 
-import re
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from operator import itemgetter
 
-import pytest
+from aoc2023.cache import cached_parse
+from aoc2023.reader import lines
 
+COLORS = {ord("r"): 0, ord("g"): 1, ord("b"): 2}
+COMMA = ord(",")
+REQUIRED = (12, 13, 14)  # red, green, blue
 
-def parse_input(file_name: str) -> list[list[dict[str, int]]]:
-    with open(file_name, "r", encoding="ascii") as data_file:
-        return [parse_game(line) for line in data_file.read().splitlines()]
 
+class Draws:
+    """Every draw of every game, one array per column: memory is 40 bytes a
+    draw whatever the number of games, with no dict or tuple per draw."""
 
-def parse_game(line: str) -> list[dict[str, int]]:
-    pattern = re.compile(r"(\d* green|\d* blue|\d* red)(?:, |$)")
-    matches = re.split("; ", line)
-    color_entries = [pattern.findall(match) for match in matches]
-    return list(map(parse_revealed_cubes, color_entries))
+    __slots__ = ("blue", "draw", "game", "green", "red")
 
+    def __init__(self):
+        for column in self.__slots__:
+            setattr(self, column, array("q"))
 
-def parse_revealed_cubes(entry: list[str]) -> dict[str, int]:
-    return {
-        color: int(quantity) for quantity, color in (item.split() for item in entry)
-    }
+    def __len__(self) -> int:
+        return len(self.game)
 
+    def append(self, game: int, draw: int, counts: list[int]) -> None:
+        self.game.append(game)
+        self.draw.append(draw)
+        self.red.append(counts[0])
+        self.green.append(counts[1])
+        self.blue.append(counts[2])
 
-def day02_part1(data: list[list[dict[str, int]]]) -> int:
-    REQUIRED = {"red": 12, "green": 13, "blue": 14}
 
-    def is_possible_game(sets_of_cubes):
-        return all(
-            revealed_quantity <= REQUIRED[color]
-            for cubes in sets_of_cubes
-            for color, revealed_quantity in cubes.items()
+@cached_parse
+def parse_input(file_name: str) -> Draws:
+    # "Game 1: 3 blue, 4 red; 1 red, 2 green" splits into pairs of tokens:
+    # ("Game", "1:"), then a count and its color, followed by a comma unless
+    # the draw ends there.
+    draws = Draws()
+    game = draw = 0
+    counts = [0, 0, 0]
+    for line in lines(file_name):
+        tokens = iter(line.split())
+        for first, second in zip(tokens, tokens):
+            if first == b"Game":
+                game, draw = int(second[:-1]), 0
+                continue
+            counts[COLORS[second[0]]] = int(first)
+            if second[-1] != COMMA:
+                draws.append(game, draw, counts)
+                draw += 1
+                counts = [0, 0, 0]
+    return draws
+
+
+# Below this many draws, importing NumPy takes longer than the loop.
+VECTORIZE_MIN_DRAWS = 1 << 16
+
+
+def game_maxima(draws: Draws, vectorize: bool | None = None):
+    """Columns (game, most red, most green, most blue) with a row per game:
+    NumPy arrays reduced per game if vectorize (by default, for many draws),
+    arrays otherwise."""
+    if vectorize is None:
+        vectorize = len(draws) >= VECTORIZE_MIN_DRAWS
+    if vectorize:
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        def column(values):
+            return np.frombuffer(values, dtype=np.int64)
+
+        starts = np.flatnonzero(column(draws.draw) == 0)
+        return column(draws.game)[starts], *(
+            np.maximum.reduceat(column(values), starts)
+            for values in (draws.red, draws.green, draws.blue)
         )
 
-    return sum(
-        game_id
-        for game_id, sets_of_cubes in enumerate(data, start=1)
-        if is_possible_game(sets_of_cubes)
-    )
+    games, red, green, blue = array("q"), array("q"), array("q"), array("q")
+    for game, draw, r, g, b in zip(
+        draws.game, draws.draw, draws.red, draws.green, draws.blue
+    ):
+        if draw:
+            red[-1] = max(red[-1], r)
+            green[-1] = max(green[-1], g)
+            blue[-1] = max(blue[-1], b)
+        else:
+            games.append(game)
+            red.append(r)
+            green.append(g)
+            blue.append(b)
+    return games, red, green, blue
 
 
-def day02_part2(data: list[list[dict[str, int]]]) -> int:
-    def fewest_required(sets_of_cubes):
-        return {
-            color: max(cubes.get(color, 0) for cubes in sets_of_cubes)
-            for color in ["red", "green", "blue"]
-        }
+class GameIndex:
+    """Answers how many games, and which sum of game ids, were possible with
+    a bag of given red, green and blue cubes: the games whose maxima are all
+    within the bag, a dominance query in three dimensions.
 
-    def power_cubes(cubes):
-        return cubes["red"] * cubes["blue"] * cubes["green"]
+    The games are sorted by most red, so the ones within a red limit are a
+    prefix, found by bisection. A Fenwick tree over that order (node i covers
+    the i & -i games up to the i-th) splits any prefix into O(log games)
+    nodes. Each node sorts its games by most green under a Fenwick tree of
+    its own, whose nodes hold their most blue in order with running sums of
+    the ids. A query bisects O(log^2 games) of these lists, and the index
+    holds O(games log^2 games) numbers whatever the range of the counts.
+    Building sorts the games, after the O(draws) pass of game_maxima."""
 
-    return sum(power_cubes(fewest_required(sets_of_cubes)) for sets_of_cubes in data)
+    __slots__ = ("blues", "greens", "rows", "sums")
 
+    def __init__(self, games, red, green, blue):
+        # (most red, most green, most blue, game id) per game, by most red.
+        self.rows = sorted(zip(red, green, blue, games))
+        # Node by node of the red tree, the most green of its games in order
+        # and, node by node of its green tree, their most blue in order and
+        # the running sums of their ids. Index 0 of each tree is unused.
+        self.greens, self.blues, self.sums = [None], [None], [None]
+        for node in range(1, len(self.rows) + 1):
+            covered = sorted(self.rows[node - (node & -node) : node], key=itemgetter(1))
+            self.greens.append([row[1] for row in covered])
+            blues, sums = [None], [None]
+            for inner in range(1, len(covered) + 1):
+                rows = sorted(
+                    covered[inner - (inner & -inner) : inner], key=itemgetter(2)
+                )
+                blues.append([row[2] for row in rows])
+                sums.append(list(accumulate((row[3] for row in rows), initial=0)))
+            self.blues.append(blues)
+            self.sums.append(sums)
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day02_test.txt")
+    @classmethod
+    def from_draws(cls, draws: Draws) -> "GameIndex":
+        return cls(*game_maxima(draws))
+
+    def possible_games(self, red: int, green: int, blue: int) -> tuple[int, int]:
+        """(number, sum of the ids) of the games possible with the bag."""
+        count = id_sum = 0
+        node = bisect_right(self.rows, red, key=itemgetter(0))
+        while node:
+            blues, sums = self.blues[node], self.sums[node]
+            inner = bisect_right(self.greens[node], green)
+            while inner:
+                below = bisect_right(blues[inner], blue)
+                count += below
+                id_sum += sums[inner][below]
+                inner &= inner - 1
+            node &= node - 1
+        return count, id_sum
+
+    def possible_games_many(self, limits) -> tuple[array, array]:
+        """possible_games for every (red, green, blue) row of limits, as two
+        arrays: the counts and the sums of ids.
+
+        Answered offline, sweeping the limits by red: the games within each
+        limit are added to a Fenwick tree over their order by most green,
+        whose nodes keep the sorted most blue of the games they will cover and
+        Fenwick trees of counts and id sums over those. A game or a limit
+        costs O(log^2 games), the trees hold O(games log games) numbers."""
+        limits = [tuple(row) for row in limits]
+        size = len(self.rows)
+        by_green = sorted(range(size), key=lambda game: self.rows[game][1])
+        greens = [self.rows[game][1] for game in by_green]
+        position = [0] * size
+        for place, game in enumerate(by_green, 1):
+            position[game] = place
+        blues = [None] + [
+            sorted(
+                self.rows[game][2] for game in by_green[node - (node & -node) : node]
+            )
+            for node in range(1, size + 1)
+        ]
+        counts = [None] + [[0] * (len(values) + 1) for values in blues[1:]]
+        sums = [None] + [[0] * (len(values) + 1) for values in blues[1:]]
+
+        answer_counts = array("q", [0]) * len(limits)
+        answer_sums = array("q", [0]) * len(limits)
+        added = 0
+        for query in sorted(range(len(limits)), key=lambda query: limits[query][0]):
+            red, green, blue = limits[query]
+            while added < size and self.rows[added][0] <= red:
+                _, _, game_blue, game = self.rows[added]
+                node = position[added]
+                while node <= size:
+                    slot = bisect_left(blues[node], game_blue) + 1
+                    node_counts, node_sums = counts[node], sums[node]
+                    while slot < len(node_counts):
+                        node_counts[slot] += 1
+                        node_sums[slot] += game
+                        slot += slot & -slot
+                    node += node & -node
+                added += 1
+            node = bisect_right(greens, green)
+            while node:
+                slot = bisect_right(blues[node], blue)
+                node_counts, node_sums = counts[node], sums[node]
+                while slot:
+                    answer_counts[query] += node_counts[slot]
+                    answer_sums[query] += node_sums[slot]
+                    slot &= slot - 1
+                node &= node - 1
+        return answer_counts, answer_sums
+
+
+def day02_part1(data: Draws) -> int:
+    games, red, green, blue = game_maxima(data)
+    max_red, max_green, max_blue = REQUIRED
+    if isinstance(games, array):
+        return sum(
+            game
+            for game, r, g, b in zip(games, red, green, blue)
+            if r <= max_red and g <= max_green and b <= max_blue
+        )
+    possible = (red <= max_red) & (green <= max_green) & (blue <= max_blue)
+    return int(games[possible].sum())
+
+
+def day02_part2(data: Draws) -> int:
+    _, red, green, blue = game_maxima(data)
+    if isinstance(red, array):
+        return sum(r * g * b for r, g, b in zip(red, green, blue))
+    return int((red * green * blue).sum())
+
+
+TEST_INPUT = "data/day02_test.txt"
 
 
 def test_day02_part1(test_data):
@@ -69,6 +237,27 @@ def test_day02_part2(test_data):
     assert day02_part2(test_data) == 2286
 
 
+def test_game_index(test_data):
+    index = GameIndex.from_draws(test_data)
+    # Games 1 to 5 need at least (4, 2, 6), (1, 3, 4), (20, 13, 6),
+    # (14, 3, 15) and (6, 3, 2) cubes.
+    assert index.possible_games(*REQUIRED) == (3, 8)
+    assert index.possible_games(20, 13, 15) == (5, 15)
+    assert index.possible_games(6, 3, 6) == (3, 8)
+    assert index.possible_games(0, 100, 100) == (0, 0)
+    counts, sums = index.possible_games_many([REQUIRED, (6, 3, 6), (100, 0, 100)])
+    assert list(counts) == [3, 3, 0] and list(sums) == [8, 8, 0]
+
+
+def test_game_maxima(test_data):
+    assert list(test_data.blue[:3]) == [3, 6, 0]
+    columns = game_maxima(test_data, vectorize=False)
+    assert [list(column) for column in columns] == [
+        list(column) for column in game_maxima(test_data, vectorize=True)
+    ]
+    assert list(columns[1]) == [4, 1, 20, 14, 6]
+
+
 if __name__ == "__main__":
     input_data = parse_input("data/day02.txt")
 
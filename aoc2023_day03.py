@@ -3,90 +3,74 @@
     Day 03: Gear Ratios
 """
 
-from itertools import product
+from array import array
 
-import pytest
+from aoc2023.cache import cached_parse
+from aoc2023.grid import NEWLINE, Grid
 
+DOT = ord(".")
+STAR = ord("*")
+ZERO = ord("0")
+NINE = ord("9")
 
+
+@cached_parse
 def parse_input(file_name):
-    with open(file_name, "r", encoding="ascii") as data_file:
-        grid = data_file.read().splitlines()
-
-    numbers = []
-    symbols = set()
-    for i, row in enumerate(grid):
-        for j, char in enumerate(row):
-            if char == ".":
-                continue
-            if char.isdigit():
-                if numbers and (i, j - 1) in numbers[-1]:
-                    numbers[-1].append((i, j))
-                else:
-                    numbers.append([(i, j)])
-            else:
-                symbols.add((i, j))
-
-    return grid, [tuple(number) for number in numbers], symbols
-
-
-def get_neighbors(pos):
-    i, j = pos
-    return (
-        (i + di, j + dj)
-        for di, dj in product([-1, 0, 1], repeat=2)
-        if (di, dj) != (0, 0)
-    )
-
-
-def get_outer_edge(positions):
-    min_col = min(pos[1] for pos in positions)
-    max_col = max(pos[1] for pos in positions)
-    min_row = min(pos[0] for pos in positions)
-    max_row = max(pos[0] for pos in positions)
-    for col in range(min_col - 1, max_col + 2):
-        yield min_row - 1, col
-    for row in range(min_row, max_row + 1):
-        yield row, min_col - 1
-        yield row, max_col + 1
-    for col in range(min_col - 1, max_col + 2):
-        yield max_row + 1, col
-
-
-def number_from_digit_coordinates(grid, digit_coordinates):
-    return int("".join(grid[i][j] for (i, j) in digit_coordinates))
+    # number_at[cell] is the index in values of the number whose digits cover
+    # cell, or -1, so that the numbers around a symbol are 8 lookups away.
+    grid = Grid.from_file(file_name)
+    values = []
+    number_at = array("q", [-1]) * len(grid.data)
+    symbols = []
+    start = None
+    for idx, char in enumerate(grid.data):
+        if ZERO <= char <= NINE:
+            if start is None:
+                start = idx
+            continue
+        if start is not None:
+            number_at[start:idx] = array("q", [len(values)]) * (idx - start)
+            values.append(int(grid.data[start:idx]))
+            start = None
+        if char not in (DOT, NEWLINE):
+            symbols.append(idx)
+
+    return grid, values, number_at, symbols
+
+
+def adjacent_numbers(grid, number_at, pos) -> list[int]:
+    """Indices of the distinct numbers next to pos, in reading order."""
+    found = []
+    for delta in grid.deltas8:
+        if 0 <= pos + delta < len(number_at):
+            number = number_at[pos + delta]
+            if number >= 0 and number not in found:
+                found.append(number)
+    return sorted(found)
 
 
 def day03_part1(data):
-    grid, numbers, symbols = data
-    return sum(
-        number_from_digit_coordinates(grid, number)
-        for number in numbers
-        if symbols & set(get_outer_edge(number))
-    )
+    grid, values, number_at, symbols = data
+    part_numbers = set()
+    for symbol in symbols:
+        part_numbers.update(adjacent_numbers(grid, number_at, symbol))
+    return sum(values[number] for number in part_numbers)
 
 
 def day03_part2(data):
-    grid, numbers, symbols = data
+    grid, values, number_at, symbols = data
     ans = 0
     for symbol in symbols:
-        i, j = symbol
-        if grid[i][j] != "*":
+        if grid.data[symbol] != STAR:
             continue
-        symbol_neighbors = set(get_neighbors(symbol))
-        adjacent_numbers = [
-            number_from_digit_coordinates(grid, number)
-            for number in numbers
-            if set(number) & symbol_neighbors
-        ]
-        if len(adjacent_numbers) > 1:
+        numbers = adjacent_numbers(grid, number_at, symbol)
+        if len(numbers) > 1:
             # this is a gear ratio
-            ans += adjacent_numbers[0] * adjacent_numbers[1]
+            ans += values[numbers[0]] * values[numbers[1]]
     return ans
 
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day03_test.txt")
+TEST_INPUT = "data/day03_test.txt"
 
 
 def test_day03_part1(test_data):
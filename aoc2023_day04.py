@@ -5,23 +5,25 @@
 
 import re
 
-import pytest
+from aoc2023.cache import cached_parse
+from aoc2023.reader import Lines
 
+PATTERN = re.compile(rb"Card ([\d ]+): ([\d ]+) \| ([\d ]+)")
+
+
+def parse_line(line):
+    if match := PATTERN.match(line):
+        return (
+            int(match.group(1)),
+            set(map(int, match.group(2).split())),
+            set(map(int, match.group(3).split())),
+        )
+    raise ValueError(f"Error parsing line {line}")
 
-def parse_input(file_name):
-    pattern = re.compile(r"Card ([\d ]+): ([\d ]+) \| ([\d ]+)")
-
-    def parse_line(line):
-        if match := pattern.match(line):
-            return (
-                int(match.group(1)),
-                set(map(int, match.group(2).split())),
-                set(map(int, match.group(3).split())),
-            )
-        raise ValueError(f"Error parsing line {line}")
 
-    with open(file_name, "r", encoding="ascii") as data_file:
-        return [parse_line(line) for line in data_file.read().splitlines()]
+@cached_parse
+def parse_input(file_name):
+    return Lines(file_name, parse_line)
 
 
 def day04_part1(cards):
@@ -34,8 +36,8 @@ def day04_part1(cards):
 def day04_part2_recursion(cards):
     """Just wanted to leave also a first version of the solution using recursion."""
     matches = {card_id: len(winning & have) for card_id, winning, have in cards}
-    quantity = {card_id: 0 for card_id, _, _ in cards}
-    max_card_id = len(cards)
+    quantity = {card_id: 0 for card_id in matches}
+    max_card_id = len(matches)
 
     def update_quantity(card_id):
         quantity[card_id] += 1
@@ -43,7 +45,7 @@ def day04_part2_recursion(cards):
             if below <= max_card_id:
                 update_quantity(below)
 
-    for card_id, _, _ in cards:
+    for card_id in matches:
         update_quantity(card_id)
 
     return sum(quantity.values())
@@ -51,9 +53,9 @@ def day04_part2_recursion(cards):
 
 def day04_part2(cards):
     matches = {card_id: len(winning & have) for card_id, winning, have in cards}
-    quantity = {card_id: 0 for card_id, _, _ in cards}
-    max_card_id = len(cards)
-    stack = [card_id for card_id, _, _ in cards]
+    quantity = {card_id: 0 for card_id in matches}
+    max_card_id = len(matches)
+    stack = list(matches)
     while stack:
         current_card_id = stack.pop()
         quantity[current_card_id] += 1
@@ -68,9 +70,7 @@ def day04_part2(cards):
     return sum(quantity.values())
 
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day04_test.txt")
+TEST_INPUT = "data/day04_test.txt"
 
 
 def test_day04_part1(test_data):
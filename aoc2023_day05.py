@@ -3,93 +3,57 @@
     Day 05: If You Give A Seed A Fertilizer
 """
 
-from functools import reduce
+from functools import partial, reduce
 
-import pytest
+from aoc2023 import intervals, parallel
+from aoc2023.cache import cached_parse
 
 
+@cached_parse
 def parse_input(file_name):
     with open(file_name, "r", encoding="ascii") as data_file:
         first, *others = data_file.read().split("\n\n")
     seeds = list(map(int, first.split(":")[1].split()))
+    # Each map as the sorted (source start, source end, offset) of its rules.
     sections = [
-        [tuple(map(int, line.split())) for line in chunk.split("\n")[1:]]
+        sorted(
+            (source_start, source_start + size, dest_start - source_start)
+            for dest_start, source_start, size in (
+                map(int, line.split()) for line in chunk.split("\n")[1:] if line
+            )
+        )
         for chunk in others
     ]
     return seeds, sections
 
 
-def convert_single(x: int, rules: list[tuple[int, int, int]]) -> int:
-    return next(
-        (
-            x - source_start + dest_start
-            for dest_start, source_start, size in rules
-            if source_start <= x < source_start + size
-        ),
-        x,
-    )
-
-
 def grouper(n, iterable):
     args = [iter(iterable)] * n
     return zip(*args)
 
 
-def convert_range(
-    ranges: list[tuple[int, int]], rules: list[tuple[int, int, int]]
-) -> list[tuple[int, int]]:
-    locations = []
-
-    for dest_start, source_start, size in rules:
-        source_end = source_start + size
-        new_ranges = []
-
-        for a, b in ranges:
-            before = (a, min(b, source_start))
-            inter = (max(a, source_start), min(source_end, b))
-            after = (max(source_end, a), b)
-
-            new_ranges.extend(
-                interval for interval in [before, after] if interval[1] > interval[0]
-            )
-
-            locations.extend(
-                (
-                    inter[0] - source_start + dest_start,
-                    inter[1] - source_start + dest_start,
-                )
-                for inter in [inter]
-                if inter[1] > inter[0]
-            )
-        ranges = new_ranges
-
-    return locations + ranges
-
-
 def day05_part1(data):
     seeds, sections = data
 
     def location(seed):
-        return reduce(convert_single, sections, seed)
+        return reduce(intervals.shift_point, sections, seed)
 
     return min(location(seed) for seed in seeds)
 
 
-def day05_part2(data):
-    seeds, sections = data
+def min_location_seed_range(sections, seed_range: tuple[int, int]) -> int:
+    start_seed, size = seed_range
+    return reduce(intervals.shift, sections, [(start_seed, start_seed + size)])[0][0]
 
-    def min_location_seed_range(seed_range: tuple[int, int]) -> int:
-        start_seed, size = seed_range
-        return min(reduce(convert_range, sections, [(start_seed, start_seed + size)]))[
-            0
-        ]
 
-    return min(min_location_seed_range(seed_range) for seed_range in grouper(2, seeds))
+def day05_part2(data):
+    seeds, sections = data
+    return min(
+        parallel.pmap(partial(min_location_seed_range, sections), grouper(2, seeds))
+    )
 
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day05_test.txt")
+TEST_INPUT = "data/day05_test.txt"
 
 
 def test_day05_part1(test_data):
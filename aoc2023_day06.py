@@ -6,9 +6,10 @@
 import re
 from math import ceil, floor, prod, sqrt
 
-import pytest
+from aoc2023.cache import cached_parse
 
 
+@cached_parse
 def parse_input(file_name: str) -> list[list[str]]:
     with open(file_name, "r", encoding="ascii") as data_file:
         return [re.findall(r"\d+", line) for line in data_file.read().splitlines()]
@@ -45,9 +46,7 @@ def day06_part2(data: list[list[str]]) -> int:
     return count_solutions(time, distance)
 
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day06_test.txt")
+TEST_INPUT = "data/day06_test.txt"
 
 
 def test_day06_part1(test_data):
@@ -3,9 +3,8 @@
     Day 07: Camel Cards
 """
 
-from collections import Counter
-
-import pytest
+from aoc2023.cache import cached_parse
+from aoc2023.reader import Lines
 
 CARDS_COUNT_RANK = [
     (5,),  # five of a kind
@@ -18,30 +17,33 @@ CARDS_COUNT_RANK = [
 ]
 
 
-def parse_input(file_name):
-    def parse_line(line):
-        card, bid = line.split()
-        return (card, int(bid))
+def parse_line(line: bytes) -> tuple[str, int]:
+    card, bid = line.split()
+    return (card.decode("ascii"), int(bid))
 
-    with open(file_name, "r", encoding="ascii") as data_file:
-        return [parse_line(line) for line in data_file.read().splitlines()]
 
+@cached_parse
+def parse_input(file_name):
+    return Lines(file_name, parse_line)
 
-def hand_rank(hand: str, use_jokers=False) -> tuple[tuple[int, ...], tuple[int, ...]]:
-    c = Counter(hand)
 
-    if use_jokers and 0 < (num_jokers := c["J"]) < 5:
-        del c["J"]
-        most_common_non_joker, _ = c.most_common(1)[0]
-        c[most_common_non_joker] += num_jokers
+# Built once per process, and shared by every input solved in it.
+HAND_TYPES = {
+    counts: len(CARDS_COUNT_RANK) - rank for rank, counts in enumerate(CARDS_COUNT_RANK)
+}
+# Relabel the cards so that they sort as they rank, the joker below the 2.
+CARD_ORDER = {
+    False: str.maketrans("TJQKA", "ABCDE"),
+    True: str.maketrans("TJQKA", "A1CDE"),
+}
 
-    hand_type = tuple(sorted(c.values(), reverse=True))
-    card_ranks = tuple(
-        ("J23456789TQKA" if use_jokers else "23456789TJQKA").index(card)
-        for card in hand
-    )
 
-    return hand_type, card_ranks
+def hand_rank(hand: str, use_jokers=False) -> tuple[int, str]:
+    jokers = hand.count("J") if use_jokers else 0
+    others = hand.replace("J", "") if jokers else hand
+    counts = sorted(map(others.count, set(others)), reverse=True) or [0]
+    counts[0] += jokers  # jokers join the most common card
+    return HAND_TYPES[tuple(counts)], hand.translate(CARD_ORDER[use_jokers])
 
 
 def day07_part1(data):
@@ -54,9 +56,7 @@ def day07_part2(data):
     return sum(i * bid for i, (hand, bid) in enumerate(sorted_hands, start=1))
 
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day07_test.txt")
+TEST_INPUT = "data/day07_test.txt"
 
 
 def test_day07_part1(test_data):
@@ -3,13 +3,14 @@
     Day 08: Haunted Wasteland
 """
 
+from collections.abc import Callable
 from itertools import count, cycle
 from math import lcm
-from typing import Callable
 
-import pytest
+from aoc2023.cache import cached_parse
 
 
+@cached_parse
 def parse_input(file_name: str) -> tuple[str, dict[str, tuple[str, str]]]:
     with open(file_name, "r", encoding="ascii") as data_file:
         directions, _, *nodes = data_file.read().splitlines()
@@ -44,9 +45,7 @@ def day08_part2(data: tuple[str, dict[str, tuple[str, str]]]) -> int:
     return lcm(*solutions)
 
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return [parse_input("data/day08_test1.txt"), parse_input("data/day08_test2.txt")]
+TEST_INPUT = ["data/day08_test1.txt", "data/day08_test2.txt"]
 
 
 def test_day08_part1(test_data):
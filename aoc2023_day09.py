@@ -3,24 +3,36 @@
     Day 09: Mirage Maintenance
 """
 
-from itertools import pairwise
+from functools import cache
+from math import comb
+from operator import mul
 
-import pytest
+from aoc2023.cache import cached_parse
+from aoc2023.reader import Lines
 
 
+def parse_line(line: bytes) -> list[int]:
+    return [int(x) for x in line.split()]
+
+
+@cached_parse
 def parse_input(file_name):
-    with open(file_name, "r", encoding="ascii") as data_file:
-        return [
-            [int(x) for x in line.split()] for line in data_file.read().splitlines()
-        ]
+    return Lines(file_name, parse_line)
+
 
+@cache
+def weights(length: int, backwards: bool = False) -> tuple[int, ...]:
+    # The differences of a sequence vanish at order length at the latest, so
+    # the value after it (or before it) is a fixed combination of its values,
+    # with binomial coefficients of alternating signs. Each length is computed
+    # once per process.
+    if backwards:
+        return tuple((-1) ** i * comb(length, i + 1) for i in range(length))
+    return tuple((-1) ** (length - 1 - i) * comb(length, i) for i in range(length))
 
-def extrapolate(seq: list[int], backwards: bool=False) -> int:
-    if all(x == 0 for x in seq):
-        return 0
-    idx, sgn = (0, -1) if backwards else (-1, +1)
-    next_seq = [b - a for a, b in pairwise(seq)]
-    return seq[idx] + sgn * extrapolate(next_seq, backwards)
+
+def extrapolate(seq: list[int], backwards: bool = False) -> int:
+    return sum(map(mul, weights(len(seq), backwards), seq))
 
 
 def day09_part1(data):
@@ -31,9 +43,7 @@ def day09_part2(data):
     return sum(extrapolate(seq, backwards=True) for seq in data)
 
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day09_test.txt")
+TEST_INPUT = "data/day09_test.txt"
 
 
 def test_day09_part1(test_data):
@@ -44,6 +54,12 @@ def test_day09_part2(test_data):
     assert day09_part2(test_data) == 2
 
 
+def test_extrapolate():
+    assert extrapolate([1, 3, 6, 10, 15, 21]) == 28
+    assert extrapolate([10, 13, 16, 21, 30, 45], backwards=True) == 5
+    assert extrapolate([7]) == extrapolate([7], backwards=True) == 7
+
+
 if __name__ == "__main__":
     input_data = parse_input("data/day09.txt")
 
@@ -3,59 +3,50 @@
     Day 11: Cosmic Expansion
 """
 
-from itertools import combinations
+from bisect import bisect_left
 
-import pytest
+from aoc2023.cache import cached_parse
+from aoc2023.grid import Grid
 
 
+@cached_parse
 def parse_input(file_name):
-    with open(file_name, "r", encoding="ascii") as data_file:
-        grid = data_file.read().splitlines()
-        num_rows, num_cols = len(grid), len(grid[0])
-        galaxies = {
-            (i, j)
-            for i, row in enumerate(grid)
-            for j, symbol in enumerate(row)
-            if symbol == "#"
-        }
-    empty_rows = set(range(num_rows)) - set(i for i, _ in galaxies)
-    empty_cols = set(range(num_cols)) - set(j for _, j in galaxies)
+    grid = Grid.from_file(file_name)
+    galaxies = {grid.position(idx) for idx in grid.find_all(b"#")}
+    empty_rows = set(range(grid.height)) - set(i for i, _ in galaxies)
+    empty_cols = set(range(grid.width)) - set(j for _, j in galaxies)
     return galaxies, empty_rows, empty_cols
 
 
-def distance(
-    a: tuple[int, int],
-    b: tuple[int, int],
-    empty_rows: set[int],
-    empty_cols: set[int],
-    scale: int,
-) -> int:
-    a_row, a_col = a
-    b_row, b_col = b
-    num_scaled_rows = sum(a_row < r < b_row or b_row < r < a_row for r in empty_rows)
-    num_scaled_cols = sum(a_col < c < b_col or b_col < c < a_col for c in empty_cols)
-    base_dist = abs(b_row - a_row) + abs(b_col - a_col)
-    return base_dist + (num_scaled_rows + num_scaled_cols) * (scale - 1)
+def expand(coordinates: list[int], empty: set[int], scale: int) -> list[int]:
+    """The coordinates, sorted, once every empty line is widened to scale lines."""
+    empty_before = sorted(empty)
+    return sorted(c + bisect_left(empty_before, c) * (scale - 1) for c in coordinates)
 
 
-def day11_part1(data):
+def sum_of_distances(coordinates: list[int]) -> int:
+    # In sorted order, the i-th coordinate is added once for each of the i
+    # before it and subtracted once for each of the n - i - 1 after it.
+    n = len(coordinates)
+    return sum(c * (2 * i - n + 1) for i, c in enumerate(coordinates))
+
+
+def total_distance(data, scale: int) -> int:
     galaxies, empty_rows, empty_cols = data
-    return sum(
-        distance(a, b, empty_rows, empty_cols, 2) for a, b in combinations(galaxies, 2)
-    )
+    rows = expand([r for r, _ in galaxies], empty_rows, scale)
+    cols = expand([c for _, c in galaxies], empty_cols, scale)
+    return sum_of_distances(rows) + sum_of_distances(cols)
+
+
+def day11_part1(data):
+    return total_distance(data, 2)
 
 
 def day11_part2(data):
-    galaxies, empty_rows, empty_cols = data
-    return sum(
-        distance(a, b, empty_rows, empty_cols, 1_000_000)
-        for a, b in combinations(galaxies, 2)
-    )
+    return total_distance(data, 1_000_000)
 
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day11_test.txt")
+TEST_INPUT = "data/day11_test.txt"
 
 
 def test_day11_part1(test_data):
@@ -3,11 +3,13 @@
     Day 12: Hot Springs
 """
 
-from functools import cache
+from functools import cache, wraps
 
-import pytest
+from aoc2023 import counters, parallel
+from aoc2023.cache import cached_parse
 
 
+@cached_parse
 def parse_input(file_name):
     def parse_line(line):
         line = line.split()
@@ -37,19 +39,42 @@ def count_possible(seq: str, sizes: tuple[int]) -> int:
     return num_solutions
 
 
+def count_cache_usage(func):
+    """Report the hits and misses of the count_possible cache during func."""
+
+    @wraps(func)
+    def wrapper(data):
+        before = count_possible.cache_info()
+        result = func(data)
+        after = count_possible.cache_info()
+        counters.add("day12.cache_hits", after.hits - before.hits)
+        counters.add("day12.cache_misses", after.misses - before.misses)
+        return result
+
+    return wrapper
+
+
+def arrangements(row: tuple[str, tuple[int]]) -> int:
+    line, sizes = row
+    return count_possible(line + ".", sizes)
+
+
+def unfolded_arrangements(row: tuple[str, tuple[int]]) -> int:
+    line, sizes = row
+    return count_possible("?".join([line] * 5) + ".", sizes * 5)
+
+
+@count_cache_usage
 def day12_part1(data):
-    return sum(count_possible(line + ".", sizes) for line, sizes in data)
+    return sum(parallel.pmap(arrangements, data))
 
 
+@count_cache_usage
 def day12_part2(data):
-    return sum(
-        count_possible("?".join([line] * 5) + ".", sizes * 5) for line, sizes in data
-    )
+    return sum(parallel.pmap(unfolded_arrangements, data))
 
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day12_test.txt")
+TEST_INPUT = "data/day12_test.txt"
 
 
 def test_day12_part1(test_data):
@@ -60,6 +85,15 @@ def test_day12_part2(test_data):
     assert day12_part2(test_data) == 525152
 
 
+def test_day12_memory(test_data):
+    from aoc2023.memory import memory_budget  # pylint: disable=import-outside-toplevel
+
+    count_possible.cache_clear()
+    with memory_budget(1_500_000):
+        day12_part1(test_data)
+        day12_part2(test_data)
+
+
 if __name__ == "__main__":
     input_data = parse_input("data/day12.txt")
 
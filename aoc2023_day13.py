@@ -4,17 +4,19 @@
 """
 
 
-import pytest
+from collections.abc import Sequence
 
-Rows = list[str]
+from aoc2023.cache import cached_parse
+from aoc2023.grid import Grid
 
-def parse_input(file_name: str) -> list[Rows]:
-    with open(file_name, "r", encoding="ascii") as data_file:
-        return [pattern.splitlines() for pattern in data_file.read().split("\n\n")]
+Rows = Sequence[memoryview]
 
 
-def transpose(pattern: Rows) -> Rows:
-    return list(map("".join, zip(*pattern)))
+@cached_parse
+def parse_input(file_name: str) -> list[Grid]:
+    with open(file_name, "rb") as data_file:
+        data = data_file.read().replace(b"\r\n", b"\n")
+    return [Grid(pattern) for pattern in data.split(b"\n\n")]
 
 
 def count_differences(rows_a: Rows, rows_b: Rows, max_count: int=0) -> int:
@@ -46,24 +48,22 @@ def count_reflections(pattern: Rows, allowed_smudges: int=0) -> int:
     return 0
 
 
-def day13_part1(data: list[Rows]) -> int:
+def day13_part1(data: list[Grid]) -> int:
     return sum(
-        100 * count_reflections(pattern) + count_reflections(transpose(pattern))
+        100 * count_reflections(pattern.rows()) + count_reflections(pattern.cols())
         for pattern in data
     )
 
 
-def day13_part2(data: list[Rows]) -> int:
+def day13_part2(data: list[Grid]) -> int:
     return sum(
-        100 * count_reflections(pattern, allowed_smudges=1)
-        + count_reflections(transpose(pattern), allowed_smudges=1)
+        100 * count_reflections(pattern.rows(), allowed_smudges=1)
+        + count_reflections(pattern.cols(), allowed_smudges=1)
         for pattern in data
     )
 
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day13_test.txt")
+TEST_INPUT = "data/day13_test.txt"
 
 
 def test_day13_part1(test_data):
@@ -3,88 +3,89 @@
     Day 14: Parabolic Reflector Dish
 """
 
-import numpy as np
-import pytest
+from aoc2023 import counters, cycles
+from aoc2023.cache import cached_parse
+from aoc2023.grid import Grid
 
-
-def parse_input(file_name):
-    with open(file_name, "r", encoding="ascii") as data_file:
-        return data_file.read().splitlines()
+ROUND = ord("O")
+CUBE = ord("#")
+EMPTY = ord(".")
 
 
-def tilt_north(grid):
-    heigth = len(grid)
-    for i, row in enumerate(grid):
-        for j, symbol in enumerate(row):
-            if symbol == ".":
-                # look for first rounded rock that could roll into this space
-                k = next((k for k in range(i + 1, heigth) if grid[k][j] != "."), None)
-                if k and grid[k][j] == "O":
-                    grid[i][j] = "O"
-                    grid[k][j] = "."
+@cached_parse
+def parse_input(file_name):
+    return Grid.from_file(file_name)
+
+
+def lanes(grid, direction):
+    # Flat index ranges, each one running from the edge the rocks roll towards.
+    h, w, s = grid.height, grid.width, grid.stride
+    match direction:
+        case "N":
+            return [range(c, c + h * s, s) for c in range(w)]
+        case "S":
+            return [range(c + (h - 1) * s, c - 1, -s) for c in range(w)]
+        case "W":
+            return [range(r * s, r * s + w) for r in range(h)]
+        case "E":
+            return [range(r * s + w - 1, r * s - 1, -1) for r in range(h)]
+
+
+def tilt(grid, grid_lanes):
+    data = grid.data
+    for lane in grid_lanes:
+        free = 0  # where the next rounded rock comes to rest along the lane
+        for k, idx in enumerate(lane):
+            symbol = data[idx]
+            if symbol == CUBE:
+                free = k + 1
+            elif symbol == ROUND:
+                if free != k:
+                    data[lane[free]] = ROUND
+                    data[idx] = EMPTY
+                free += 1
 
 
 def total_load_north_beam(grid):
-    return sum(i * row.count("O") for i, row in enumerate(reversed(grid), start=1))
+    data, s = grid.data, grid.stride
+    return sum(
+        (grid.height - r) * data.count(b"O", r * s, r * s + grid.width)
+        for r in range(grid.height)
+    )
 
 
-def tilt_cycle(grid):
+def tilt_cycle(grid, cycle_lanes):
     # A cycle tilts the grid in North, West, South, East direction.
-    # Because we only want to use the tilt_north function,
-    # we rotate the grid, then tilt north, then rotate back.
-    # N, W, S, E correspond to 0, -1, 2, 1 parameters for np.rot90.
-    for rotation in (0, -1, 2, 1):
-        grid = np.rot90(grid, rotation)
-        tilt_north(grid)
-        grid = np.rot90(grid, -rotation)
+    for grid_lanes in cycle_lanes:
+        tilt(grid, grid_lanes)
     return grid
 
 
-def concatenate_grid(grid):
-    return "".join("".join(row) for row in grid)
-
-
-def apply_periodic_function(periodic_func, initial, hash_func, num_cycles):
-    seen = {}
-    current = initial
-
-    for cycle in range(num_cycles):
-        hashed = hash_func(current)
-        if hashed not in seen:
-            seen[hashed] = cycle
-            current = periodic_func(current)
-        else:
-            # Detected a period
-            cycle_difference = cycle - seen[hashed]
-            remaining_cycles = (num_cycles - cycle) % cycle_difference
-            # Fast forward
-            for _ in range(remaining_cycles):
-                current = periodic_func(current)
-            break
-
-    return current
-
-
 def day14_part1(data):
-    grid = [list(line) for line in data]
-    tilt_north(grid)
+    grid = data.copy()
+    tilt(grid, lanes(grid, "N"))
     return total_load_north_beam(grid)
 
 
 def day14_part2(data):
-    grid = np.array([list(line) for line in data])
-    apply_periodic_function(
-        periodic_func=tilt_cycle,
-        initial=grid,
-        hash_func=concatenate_grid,
-        num_cycles=1_000_000_000,
+    grid = data.copy()
+    cycle_lanes = [lanes(grid, direction) for direction in "NWSE"]
+    num_cycles = 1_000_000_000
+    # The grid is tilted in place, only the fingerprint and load of each state
+    # are kept, and the load after num_cycles is read from them.
+    start, period, loads = cycles.find_cycle(
+        step=lambda grid: tilt_cycle(grid, cycle_lanes),
+        state=grid,
+        project=total_load_north_beam,
+        key=lambda grid: cycles.fingerprint(grid.data),
+        limit=num_cycles,
     )
-    return total_load_north_beam(grid.tolist())
+    counters.add("day14.period", period)
+    counters.add("day14.cycles_simulated", len(loads))
+    return cycles.at_step(num_cycles, start, period, loads)
 
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day14_test.txt")
+TEST_INPUT = "data/day14_test.txt"
 
 
 def test_day14_part1(test_data):
@@ -3,18 +3,20 @@
     Day 15: Lens Library
 """
 
-from dataclasses import dataclass
 from functools import reduce
 
-import pytest
+from aoc2023.cache import cached_parse
 
 
-@dataclass
 class Lens:
-    label: str
-    focal_length: int
+    __slots__ = ("focal_length", "label")
 
+    def __init__(self, label: str, focal_length: int):
+        self.label = label
+        self.focal_length = focal_length
 
+
+@cached_parse
 def parse_input(file_name):
     with open(file_name, "r", encoding="ascii") as data_file:
         return data_file.read().split(",")
@@ -59,9 +61,7 @@ def day15_part2(data):
     )
 
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day15_test.txt")
+TEST_INPUT = "data/day15_test.txt"
 
 
 def test_day15_part1(test_data):
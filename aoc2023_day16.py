@@ -1,58 +1,64 @@
 """
     Advent of Code 2023
     Day 16: The Floor Will Be Lava
+
+    Part 2 does not follow the beam from each start of the border on its own,
+    which would take the number of starts times the size of the grid. The beam
+    states (a tile and a direction) and the steps between them form a graph,
+    walked once: its strongly connected components come out of Tarjan's
+    algorithm after every component they lead to, so each gets the set of
+    tiles reachable from it, a bitset of its own tiles ORed with those of the
+    components it leads to.
 """
 
+from array import array
 from itertools import chain
 from collections.abc import Generator
 
-import pytest
+from aoc2023 import counters
+from aoc2023.cache import cached_parse
+from aoc2023.grid import Grid
 
-Vect2D = tuple[int, int]
-Beam = tuple[Vect2D, Vect2D]
-Grid = list[str]
+Direction = int  # index into Grid.deltas4
+Beam = tuple[int, Direction]  # flat index and direction
 
-UP = (-1, 0)
-DOWN = (1, 0)
-LEFT = (0, -1)
-RIGHT = (0, 1)
-V_DIRS = [UP, DOWN]
-H_DIRS = [LEFT, RIGHT]
+UP, DOWN, LEFT, RIGHT = range(4)
+V_DIRS = (UP, DOWN)
+H_DIRS = (LEFT, RIGHT)
 
 MIRROR = {
-    "/": {LEFT: [DOWN], RIGHT: [UP], UP: [RIGHT], DOWN: [LEFT]},
-    "\\": {LEFT: [UP], RIGHT: [DOWN], UP: [LEFT], DOWN: [RIGHT]},
+    "/": {LEFT: (DOWN,), RIGHT: (UP,), UP: (RIGHT,), DOWN: (LEFT,)},
+    "\\": {LEFT: (UP,), RIGHT: (DOWN,), UP: (LEFT,), DOWN: (RIGHT,)},
 }
 
 
 BEHAVIOR = {
-    ".": lambda d: [d],
-    "-": lambda d: [d] if d in H_DIRS else H_DIRS,
-    "|": lambda d: [d] if d in V_DIRS else V_DIRS,
+    ".": lambda d: (d,),
+    "-": lambda d: (d,) if d in H_DIRS else H_DIRS,
+    "|": lambda d: (d,) if d in V_DIRS else V_DIRS,
     "/": lambda d: MIRROR["/"][d],
     "\\": lambda d: MIRROR["\\"][d],
 }
 
-
-def is_valid(grid: Grid, location: Vect2D) -> bool:
-    heigth, width = len(grid), len(grid[0])
-    r, c = location
-    return 0 <= r < heigth and 0 <= c < width
+# Outgoing directions by cell byte and incoming direction, looked up once per step.
+NEXT_DIRECTIONS = {
+    ord(symbol): [behavior(direction) for direction in range(4)]
+    for symbol, behavior in BEHAVIOR.items()
+}
 
 
 def beam_step(grid: Grid, beam: Beam) -> Generator[Beam, None, None]:
-    (r, c), (dr, dc) = beam
-    new_location = (new_row, new_col) = (r + dr, c + dc)
-    if is_valid(grid, new_location):
-        _, direction = beam
-        symbol = grid[new_row][new_col]
-        for new_direction in BEHAVIOR[symbol](direction):
+    location, direction = beam
+    new_location = location + grid.deltas4[direction]
+    if grid.in_bounds(new_location):
+        symbol = grid.data[new_location]
+        for new_direction in NEXT_DIRECTIONS[symbol][direction]:
             yield new_location, new_direction
 
 
+@cached_parse
 def parse_input(file_name: str) -> Grid:
-    with open(file_name, "r", encoding="ascii") as data_file:
-        return data_file.read().splitlines()
+    return Grid.from_file(file_name)
 
 
 def solve(grid: Grid, start: Beam) -> int:
@@ -64,27 +70,105 @@ def solve(grid: Grid, start: Beam) -> int:
         beams.extend(
             new_beam for new_beam in beam_step(grid, beam) if new_beam not in seen
         )
+    counters.add("day16.starts")
+    counters.add("day16.beam_states", len(seen))
     return len(set(location for location, _ in seen)) - 1
 
 
+def energized(grid: Grid, starts: list[Beam]) -> list[int]:
+    """The number of tiles energized by the beam from each of starts, the
+    tiles just outside the grid they enter from."""
+    size = 4 * len(grid.data)  # beam state: 4 * flat index + direction
+
+    def following(state: int) -> list[int]:
+        beam = divmod(state, 4) if state < size else starts[state - size]
+        return [
+            4 * location + direction for location, direction in beam_step(grid, beam)
+        ]
+
+    # Iterative Tarjan, from each start (states size and up) in turn. The
+    # states of component i are members[bounds[i]:bounds[i + 1]].
+    nodes = size + len(starts)
+    order = array("q", [-1]) * nodes
+    low = array("q", [0]) * nodes
+    component = array("q", [-1]) * nodes
+    on_stack = bytearray(nodes)
+    stack, members, bounds = [], array("q"), array("q", [0])
+    for root in range(size, nodes):
+        # Visit numbers: the states visited so far are on the stack or members.
+        order[root] = low[root] = len(members) + len(stack)
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, iter(following(root)))]
+        while work:
+            state, children = work[-1]
+            for child in children:
+                if order[child] < 0:
+                    order[child] = low[child] = len(members) + len(stack)
+                    stack.append(child)
+                    on_stack[child] = 1
+                    work.append((child, iter(following(child))))
+                    break
+                if on_stack[child]:
+                    low[state] = min(low[state], order[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[state])
+                if low[state] < order[state]:
+                    continue
+                while not members or members[-1] != state:
+                    members.append(member := stack.pop())
+                    on_stack[member] = 0
+                    component[member] = len(bounds) - 1
+                bounds.append(len(members))
+    counters.add("day16.beam_states", len(members) - len(starts))
+
+    # Components come out after every one they lead to. A bitset is dropped
+    # once each edge leading to its component has been followed.
+    def leads_to(index: int) -> Generator[int, None, None]:
+        for member in members[bounds[index] : bounds[index + 1]]:
+            for child in following(member):
+                if component[child] != index:
+                    yield component[child]
+
+    count = len(bounds) - 1
+    users = [0] * count
+    for index in range(count):
+        for target in leads_to(index):
+            users[target] += 1
+    reachable = [0] * count
+    for index in range(count):
+        bits = 0
+        for member in members[bounds[index] : bounds[index + 1]]:
+            if member < size:
+                bits |= 1 << member // 4
+        for target in leads_to(index):
+            bits |= reachable[target]
+            users[target] -= 1
+            if not users[target]:
+                reachable[target] = 0
+        reachable[index] = bits
+    return [reachable[component[start]].bit_count() for start in range(size, nodes)]
+
+
 def day16_part1(data: Grid) -> int:
-    return solve(data, ((0, -1), RIGHT))
+    return solve(data, (data.index(0, -1), RIGHT))
 
 
 def day16_part2(data: Grid) -> int:
-    heigth, width = len(data), len(data[0])
+    heigth, width = data.height, data.width
     starts = chain(
-        (((r, -1), RIGHT) for r in range(heigth)),
-        (((r, width), LEFT) for r in range(heigth)),
-        (((-1, c), DOWN) for c in range(width)),
-        (((heigth, c), RIGHT) for c in range(width)),
+        ((data.index(r, -1), RIGHT) for r in range(heigth)),
+        ((data.index(r, width), LEFT) for r in range(heigth)),
+        ((data.index(-1, c), DOWN) for c in range(width)),
+        ((data.index(heigth, c), UP) for c in range(width)),
     )
-    return max(solve(data, start) for start in starts)
+    return max(energized(data, list(starts)))
 
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day16_test.txt")
+TEST_INPUT = "data/day16_test.txt"
 
 
 def test_day16_part1(test_data):
@@ -95,6 +179,20 @@ def test_day16_part2(test_data):
     assert day16_part2(test_data) == 51
 
 
+def test_energized(test_data):
+    starts = [(test_data.index(r, -1), RIGHT) for r in range(test_data.height)]
+    starts += [(test_data.index(test_data.height, c), UP) for c in (0, 3, 7)]
+    assert energized(test_data, starts) == [solve(test_data, start) for start in starts]
+
+
+def test_day16_memory(test_data):
+    from aoc2023.memory import memory_budget  # pylint: disable=import-outside-toplevel
+
+    with memory_budget(64_000):
+        day16_part1(test_data)
+        day16_part2(test_data)
+
+
 if __name__ == "__main__":
     input_data = parse_input("data/day16.txt")
 
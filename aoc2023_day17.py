@@ -3,108 +3,95 @@
     Day 17: Clumsy Crucible
 """
 
-import heapq
-
-import pytest
-
-Vect2D = tuple[int, int]
-Graph = dict[Vect2D, int]
-Node = tuple[Vect2D, Vect2D, int]
-
-UP: Vect2D = (-1, 0)
-DOWN: Vect2D = (1, 0)
-LEFT: Vect2D = (0, -1)
-RIGHT: Vect2D = (0, 1)
-DIRECTIONS: list[Vect2D] = [UP, DOWN, LEFT, RIGHT]
-OPPOSITE: dict[Vect2D, Vect2D] = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
-
-
-def parse_input(file_name: str) -> tuple[Graph, Vect2D]:
-    with open(file_name, "r", encoding="ascii") as data_file:
-        grid = data_file.read().splitlines()
-    graph = {
-        (i, j): int(heat_loss)
-        for i, row in enumerate(grid)
-        for j, heat_loss in enumerate(row)
-    }
-    destination = (len(grid) - 1, len(grid[0]) - 1)
-    return graph, destination
-
-
-def get_neighbours(graph: Graph, node: Node, min_moves: int, max_moves: int):
-    position, direction, moves = node
-
-    for new_direction in DIRECTIONS:
-        # Cannot reverse movement.
-        if new_direction == OPPOSITE[direction]:
-            continue
-
-        # Must stay within the grid.
-        (r, c), (dr, dc) = position, direction
-        new_position = r + dr, c + dc
-        if new_position not in graph:
-            continue
-
-        # Increment moves counter if proceeding in the same direction,
-        # else reset it to the initial value 1.
-        new_moves = (moves + 1) if direction == new_direction else 1
-
-        # Cannot proceed in the same direction for more than max_moves.
-        if new_moves > max_moves:
-            continue
-
-        # Cannot change direction before completing at least min_moves.
-        if direction != new_direction and moves < min_moves:
-            continue
-
-        # If we get here, this is a valid neighbour!
-        yield (new_position, new_direction, new_moves)
-
-
-def solve(graph: Graph, destination: Vect2D, min_moves: int, max_moves: int) -> int:
+from aoc2023 import search
+from aoc2023.cache import cached_parse
+from aoc2023.grid import NEWLINE, Grid
+
+# A state is a flat index times 2 plus the axis of the last move, 0 for
+# horizontal and 1 for vertical: the next move is along the other axis.
+State = int
+
+ZERO = ord("0")
+QUEUES = ("dial", "heap", "astar")
+
+
+@cached_parse
+def parse_input(file_name: str) -> tuple[Grid, int]:
+    grid = Grid.from_file(file_name)
+    destination = grid.index(grid.height - 1, grid.width - 1)
+    return grid, destination
+
+
+def make_expand(grid: Grid, min_moves: int, max_moves: int):
+    """Every state reached by turning, then going straight min_moves to
+    max_moves cells, with the heat lost on the way."""
+    # Heat loss of each cell, -1 on the newlines that end the rows.
+    heat = [cell - ZERO if cell != NEWLINE else -1 for cell in grid.data]
+    size = len(heat)
+    deltas_by_axis = ((-1, 1), (-grid.stride, grid.stride))
+
+    def expand(state: State) -> list[tuple[State, int]]:
+        position, axis = state >> 1, (state & 1) ^ 1
+        edges = []
+        for delta in deltas_by_axis[axis]:
+            cell, cost = position, 0
+            for moves in range(1, max_moves + 1):
+                cell += delta
+                if not 0 <= cell < size or heat[cell] < 0:
+                    break
+                cost += heat[cell]
+                if moves >= min_moves:
+                    edges.append((cell << 1 | axis, cost))
+        return edges
+
+    return expand
+
+
+def solve(
+    grid: Grid, destination: int, min_moves: int, max_moves: int, queue: str = "dial"
+) -> int:
     # Thanks Prof. Dijkstra
-    start = (0, 0)
-    distances = {}
-    todo = []
+    start = grid.index(0, 0)
+    expand = make_expand(grid, min_moves, max_moves)
+    size = 2 * len(grid.data)
+    # Start as if after a move on either axis, so both first turns are tried.
+    sources = (start << 1, start << 1 | 1)
+    targets = (destination << 1, destination << 1 | 1)
 
-    # Initialize heap with the start location and the two possible directions.
-    # Note the number of initial moves is set to 1 and no cost is incurred.
-    for initial_direction in [RIGHT, DOWN]:
-        heapq.heappush(todo, (0, (start, initial_direction, 1)))
+    if queue == "dial":
+        distances, target = search.dial(
+            size, sources, expand, targets, max_weight=9 * max_moves
+        )
+    elif queue == "heap":
+        distances, target = search.dijkstra(size, sources, expand, targets)
+    elif queue == "astar":
+        # Every cell costs at least 1, so the Manhattan distance never
+        # overestimates.
+        end_row, end_col = grid.position(destination)
 
-    while todo:
-        (cost, current) = heapq.heappop(todo)
-        if current in distances:
-            # We've already seen a node with the same position, direction, and moves.
-            continue
-        distances[current] = cost
-        for neigh in get_neighbours(graph, current, min_moves, max_moves):
-            position, _, _ = neigh
-            new_cost = cost + graph[position]
-            if neigh not in distances or new_cost < distances[current]:
-                # Neigh was never seen, or its new cost is better.
-                heapq.heappush(todo, (new_cost, neigh))
+        def heuristic(state: State) -> int:
+            row, col = grid.position(state >> 1)
+            return end_row - row + end_col - col
 
-    return min(
-        cost
-        for (position, _, moves), cost in distances.items()
-        if position == destination and moves >= min_moves
-    )
+        distances, target = search.astar(size, sources, expand, targets, heuristic)
+    else:
+        raise ValueError(f"unknown queue {queue!r}, expected one of {QUEUES}")
+    if target == -1:
+        raise ValueError("no path reaches the destination")
+    return distances[target]
 
 
-def day17_part1(data: tuple[Graph, Vect2D]) -> int:
-    graph, destination = data
-    return solve(graph, destination, 1, 3)
+def day17_part1(data: tuple[Grid, int]) -> int:
+    grid, destination = data
+    return solve(grid, destination, 1, 3)
 
 
-def day17_part2(data: tuple[Graph, Vect2D]) -> int:
-    graph, destination = data
-    return solve(graph, destination, 4, 10)
+def day17_part2(data: tuple[Grid, int]) -> int:
+    grid, destination = data
+    return solve(grid, destination, 4, 10)
 
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day17_test.txt")
+TEST_INPUT = "data/day17_test.txt"
 
 
 def test_day17_part1(test_data):
@@ -115,6 +102,29 @@ def test_day17_part2(test_data):
     assert day17_part2(test_data) == 94
 
 
+def test_day17_queues(test_data):
+    grid, destination = test_data
+    for queue in QUEUES:
+        assert solve(grid, destination, 1, 3, queue) == 102
+        assert solve(grid, destination, 4, 10, queue) == 94
+        # Too small to go 4 blocks straight before turning or stopping.
+        small = Grid.from_lines(["123", "456", "789"])
+        try:
+            solve(small, small.index(2, 2), 4, 10, queue)
+        except ValueError:
+            pass
+        else:
+            assert False, "no path, no heat loss"
+
+
+def test_day17_memory(test_data):
+    from aoc2023.memory import memory_budget  # pylint: disable=import-outside-toplevel
+
+    with memory_budget(1_500_000):
+        day17_part1(test_data)
+        day17_part2(test_data)
+
+
 if __name__ == "__main__":
     input_data = parse_input("data/day17.txt")
 
@@ -3,14 +3,16 @@
     Day 18: Lavaduct Lagoon
 """
 
-from itertools import pairwise
+from collections.abc import Iterable, Iterator
 
-import pytest
+from aoc2023 import polygon
+from aoc2023.cache import cached_parse
+from aoc2023.reader import Lines
 
 
-def parse_input(file_name: str) -> list[str]:
-    with open(file_name, "r", encoding="ascii") as data_file:
-        return data_file.read().strip().splitlines()
+@cached_parse
+def parse_input(file_name: str) -> Lines:
+    return Lines(file_name)
 
 
 MOVES = {"U": (0, -1), "D": (0, +1), "L": (-1, 0), "R": (+1, 0)}
@@ -22,49 +24,43 @@ def move(position: tuple[int, int], direction: str, steps: int) -> tuple[int, in
     return x + dx * steps, y + dy * steps
 
 
-def solve(moves: list[tuple[str, int]]) -> int:
+def vertices(moves: Iterable[tuple[str, int]]) -> Iterator[tuple[int, int]]:
+    # The moves are consumed as they come, keeping only the last vertex.
+    position = (0, 0)
+    for direction, steps in moves:
+        position = move(position, direction, steps)
+        yield position
+
+
+def solve(moves: Iterable[tuple[str, int]]) -> int:
     # The Shoelace Formula is used to calculate the area of a polygon given
     # the coordinates of its vertices. Pick's Theorem provides a way to
     # calculate the area of a lattice polygon (a polygon whose vertices
     # have integer coordinates) based on the number of interior lattice points
     # and the number of lattice points on the boundary.
+    _, boundary, interior = polygon.measure(vertices(moves))
+    return boundary + interior
 
-    current = (0, 0)
-    vertices: list[tuple[int, int]] = [current]
-    for direction, steps in moves:
-        current = move(current, direction, steps)
-        vertices.append(current)
-    return (
-        sum(
-            xa * yb - ya * xb + abs(xb - xa + yb - ya)
-            for (xa, ya), (xb, yb) in pairwise(vertices)
-        )
-        // 2
-        + 1
-    )
-
-
-def day18_part1(data: list[str]) -> int:
+
+def day18_part1(data: Lines) -> int:
     def decode_instruction(line):
         direction, moves, _ = line.split()
-        return direction, int(moves)
+        return direction.decode("ascii"), int(moves)
 
-    return solve([decode_instruction(line) for line in data])
+    return solve(decode_instruction(line) for line in data if line)
 
 
-def day18_part2(data: list[str]) -> int:
+def day18_part2(data: Lines) -> int:
     def decode_instruction(line):
         _, _, color = line.split()
-        direction = "RDLU"[int(color[7])]
+        direction = "RDLU"[int(color[7:8])]
         steps = int(color[2:7], 16)
         return direction, steps
 
-    return solve([decode_instruction(line) for line in data])
+    return solve(decode_instruction(line) for line in data if line)
 
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day18_test.txt")
+TEST_INPUT = "data/day18_test.txt"
 
 
 def test_day18_part1(test_data):
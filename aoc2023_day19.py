@@ -5,14 +5,17 @@
 
 
 import re
-from math import prod
 
-import pytest
+from aoc2023.cache import cached_parse
+from aoc2023.intervals import Box, split_box, volume
+
+FIELDS = "xmas"
 
 
 class Part:
     """Class representing a Part with x, m, a, s attributes."""
 
+    __slots__ = ("a", "m", "s", "x")
     pattern = re.compile(r"{x=(\d+),m=(\d+),a=(\d+),s=(\d+)}")
 
     def __init__(self, x, m, a, s):
@@ -56,6 +59,7 @@ class Part:
 
 
 class Rule:
+    __slots__ = ("condition", "target")
     pattern = re.compile(r"([a-z]+)(.)(\d+):(.+)")
 
     def __init__(self, condition, target):
@@ -71,10 +75,15 @@ class Rule:
             condition, target = None, rule_s
         return cls(condition, target)
 
-    def inverted_condition(self):
+    def split(self, box: Box) -> tuple[Box | None, Box | None]:
+        """The parts of a box of parts that match the condition, and the rest."""
+        if self.condition is None:
+            return box, None
         key, op, val = self.condition
-        new_op, new_val = (">", val - 1) if op == "<" else ("<", val + 1)
-        return (key, new_op, new_val)
+        if op == "<":
+            return split_box(box, FIELDS.index(key), val)
+        rest, matching = split_box(box, FIELDS.index(key), val + 1)
+        return matching, rest
 
     def evaluate_part(self, part):
         if self.condition is None:
@@ -90,6 +99,7 @@ class Rule:
         return f"({self.condition}, {self.target})"
 
 
+@cached_parse
 def parse_input(file_name):
     with open(file_name, "r", encoding="ascii") as data_file:
         wf_data, parts_data = data_file.read().split("\n\n")
@@ -103,35 +113,21 @@ def parse_input(file_name):
     return workflows, parts
 
 
-def add_constraint(constraints, condition):
-    # credit: https://github.com/davearussell/advent2023
-    key, op, val = condition
-    low, high = constraints.get(key, (1, 4000))
-    if op == ">":
-        if val >= high:
-            return None
-        low = val + 1
-    else:
-        if val <= low:
-            return None
-        high = val - 1
-    return dict(constraints, **{key: (low, high)})
-
-
 def trace_paths(workflows, state):
-    name, constraints = state
-    for rule in workflows[name]:
-        if rule.condition is None:
-            cons_true = constraints
-        else:
-            cons_true = add_constraint(constraints, rule.condition)
-            constraints = add_constraint(constraints, rule.inverted_condition())
-
-        if cons_true is not None:
-            if rule.target == "A":
-                yield cons_true
-            elif rule.target != "R":
-                yield from trace_paths(workflows, (rule.target, cons_true))
+    # The boxes of parts a workflow sends to A, with a stack of the boxes still
+    # to follow rather than a recursion as deep as the workflows.
+    todo = [state]
+    while todo:
+        name, box = todo.pop()
+        for rule in workflows[name]:
+            matching, box = rule.split(box)
+            if matching is not None:
+                if rule.target == "A":
+                    yield matching
+                elif rule.target != "R":
+                    todo.append((rule.target, matching))
+            if box is None:
+                break
 
 
 def day19_part1(data):
@@ -141,14 +137,12 @@ def day19_part1(data):
 
 def day19_part2(data):
     workflows, _ = data
-    initial_state = ("in", {field: (1, 4000) for field in "xmas"})
-    paths = trace_paths(workflows, initial_state)
-    return sum(prod(hi - lo + 1 for lo, hi in path.values()) for path in paths)
+    # Ratings go from 1 to 4000, the boxes are half-open.
+    initial_state = ("in", ((1, 4001),) * len(FIELDS))
+    return sum(map(volume, trace_paths(workflows, initial_state)))
 
 
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day19_test.txt")
+TEST_INPUT = "data/day19_test.txt"
 
 
 def test_day19_part1(test_data):
@@ -5,7 +5,10 @@ Day 20:
 
 # pylint: skip-file
 
+from aoc2023.cache import cached_parse
 
+
+@cached_parse
 def parse_input(file_name):
     with open(file_name, "r", encoding="ascii") as data_file:
         lines = data_file.read().splitlines()
@@ -15,6 +18,8 @@ def parse_input(file_name):
 
 
 class Pulse:
+    __slots__ = ("level", "receiver", "sender")
+
     def __init__(self, sender, receiver, level):
         self.sender = sender
         self.receiver = receiver
@@ -22,6 +27,8 @@ class Pulse:
 
 
 class Module:
+    __slots__ = ("destinations", "name")
+
     def __init__(self, name):
         self.name = name
         self.destinations = []
@@ -35,6 +42,8 @@ class Module:
 
 
 class FlipFlop(Module):
+    __slots__ = ("state",)
+
     def __init__(self, name):
         super().__init__(name)
         self.state = False  # False = off, True = on
@@ -47,6 +56,8 @@ class FlipFlop(Module):
 
 
 class Conjunction(Module):
+    __slots__ = ("memory",)
+
     def __init__(self, name):
         super().__init__(name)
         self.memory = {}
@@ -63,11 +74,15 @@ class Conjunction(Module):
 
 
 class Broadcaster(Module):
+    __slots__ = ()
+
     def receive(self, pulse, queue):
         self.send(pulse.level, queue)
 
 
 class Button:
+    __slots__ = ("broadcaster",)
+
     def __init__(self, broadcaster):
         self.broadcaster = broadcaster
 
@@ -87,9 +102,7 @@ def day20_part2(data):
 
 
 """
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day20_test.txt")
+TEST_INPUT = "data/day20_test.txt"
 
 
 def test_day20_part1(test_data):
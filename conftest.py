@@ -0,0 +1,16 @@
+"""
+    Advent of Code 2023
+    Shared pytest fixtures, so that the solutions never need to import pytest.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="module", name="test_data")
+def fixture_test_data(request):
+    """The module parse_input applied to its TEST_INPUT (a path or a list of paths)."""
+    parse_input = request.module.parse_input
+    test_input = request.module.TEST_INPUT
+    if isinstance(test_input, str):
+        return parse_input(test_input)
+    return [parse_input(file_name) for file_name in test_input]
@@ -4,9 +4,11 @@
 """
 
 # pylint: skip-file
-# import pytest
 
+from aoc2023.cache import cached_parse
 
+
+@cached_parse
 def parse_input(file_name):
     with open(file_name, "r", encoding="ascii") as data_file:
         return data_file.read().splitlines()
@@ -21,9 +23,7 @@ def day00_part2(data):
 
 
 """
-@pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data():
-    return parse_input("data/day00_test.txt")
+TEST_INPUT = "data/day00_test.txt"
 
 
 def test_day00_part1(test_data):